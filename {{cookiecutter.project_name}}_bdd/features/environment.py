@@ -4,9 +4,20 @@ from logging import config, getLogger
 from os.path import isdir
 from time import strftime
 
+from {{cookiecutter.project_name}}_bdd.support.command_recorder import CommandStream
+from {{cookiecutter.project_name}}_bdd.support.core import java_script
+from {{cookiecutter.project_name}}_bdd.support.core.deadline import Deadline
 from {{cookiecutter.project_name}}_bdd.support.core.element_action import ElementAction
+from {{cookiecutter.project_name}}_bdd.support.core.interaction_cache import (
+    InteractionStrategyCache,
+)
+from {{cookiecutter.project_name}}_bdd.support.core.locator_profiler import LocatorProfiler
 from {{cookiecutter.project_name}}_bdd.support.driver_factory import SeleniumDriverFactory
+from {{cookiecutter.project_name}}_bdd.support.driver_watchdog import DriverWatchdog
+from {{cookiecutter.project_name}}_bdd.support.page_performance import PagePerformance
+from {{cookiecutter.project_name}}_bdd.support.watch_mode import WarmSession
 from {{cookiecutter.project_name}}_bdd.utils import constants
+from {{cookiecutter.project_name}}_bdd.utils.event_stream import EventStream
 
 
 def before_all(context) -> None:
@@ -22,31 +33,33 @@ def before_all(context) -> None:
     context.userdata = context.config.userdata
 
     context.logger = setup_logger()
-    context.logger.info("\n")
-    context.logger.info(
-        "============================================================================================="
-    )
-    context.logger.info(
-        f"TESTING STARTED AT : {strftime('%Y-%m-%d %H:%M:%S')}"
-    )
-    context.logger.info(
-        "============================================================================================="
+    context.log_banners = context.userdata.get("log_banners", "") not in [
+        False,
+        "false",
+        "False",
+        "FALSE",
+        "0",
+    ]
+    log_banner(
+        context,
+        [f"TESTING STARTED AT : {strftime('%Y-%m-%d %H:%M:%S')}"],
+        separator="=",
     )
-    context.logger.info("\n")
-
-    context.browser = context.userdata.get("application_url", "")
-
-    # Get the appropriate driver for the browser specified in config file
-    driver_factory = SeleniumDriverFactory(context)
 
-    context.driver = driver_factory.get_driver()
+    context.events = None
+    if is_enabled(context, "event_stream"):
+        context.events = EventStream(constants.EVENT_STREAM_FILE)
+        context.events.emit("run_started")
 
-    # Set driver implicit timeout. Webdriver will keep polling for the element for the specified timeout
-    # period.
-    timeout = int(context.userdata.get("implicit_timeout", ""))
+    context.browser = context.userdata.get("application_url", "")
 
-    context.driver.implicitly_wait(timeout)
-    context.logger.info(f"Driver implicit timeout is set to {str(timeout)}")
+    context.driver = None
+    if WarmSession.active:
+        context.driver = reuse_warm_driver(context)
+    if context.driver is None:
+        context.driver = start_driver(context)
+    context.watchdog = DriverWatchdog(context, start_driver)
+    context.watchdog.sample()
 
     context.application_url = str(context.userdata.get("application_url", ""))
 
@@ -54,6 +67,23 @@ def before_all(context) -> None:
     context.failed_scenarios = []
     context.skipped_scenarios = []
 
+    context.scenario_deadline = None
+    context.deadline = None
+
+    context.interaction_cache = None
+    if is_enabled(context, "use_interaction_cache"):
+        context.interaction_cache = InteractionStrategyCache(
+            constants.INTERACTION_CACHE
+        )
+
+    context.locator_profiler = None
+    if is_enabled(context, "profile_locators"):
+        context.locator_profiler = LocatorProfiler()
+
+    context.page_performance = None
+    if is_enabled(context, "capture_page_performance"):
+        context.page_performance = PagePerformance()
+
 
 def before_feature(context, feature) -> None:
     """
@@ -62,19 +92,27 @@ def before_feature(context, feature) -> None:
         - context: Holds contextual information during the running of tests
         - feature: Holds contextual information about the feature during the running of tests
     """
-    context.logger.info("\n")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    log_banner(
+        context,
+        [
+            f"STARTED EXECUTION OF FEATURE: {str(feature.name)}",
+            f"Tags: {str([str(item) for item in feature.tags])}",
+            "Filename: " + str(feature.filename),
+            f"Line: {str(feature.line)}",
+        ],
     )
-    context.logger.info(f"STARTED EXECUTION OF FEATURE: {str(feature.name)}")
-    context.logger.info(f"Tags: {str([str(item) for item in feature.tags])}")
-    context.logger.info("Filename: " + str(feature.filename))
-    context.logger.info(f"Line: {str(feature.line)}")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    emit_start(
+        context,
+        "feature",
+        name=feature.name,
+        tags=feature.tags,
+        filename=feature.filename,
+        line=feature.line,
     )
 
+    start_command_stream(context, f"feature {feature.filename}")
     context.driver.get(context.application_url)
+    capture_page_performance(context, f"feature {feature.name}")
 
     context.element_action = ElementAction(context)
 
@@ -86,25 +124,71 @@ def before_scenario(context, scenario) -> None:
         - context: Holds contextual information during the running of tests
         - scenario: Holds contextual information about scenario during the running of tests
     """
-    context.logger.info("\n")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    log_banner(
+        context,
+        [
+            f"STARTED EXECUTION OF SCENARIO: {str(scenario.name)}",
+            f"Tags: {str([str(item) for item in scenario.tags])}",
+            f"Filename: {str(scenario.filename)}",
+            f"Line: {str(scenario.line)}",
+        ],
     )
-    context.logger.info(f"STARTED EXECUTION OF SCENARIO: {str(scenario.name)}")
-    context.logger.info(f"Tags: {str([str(item) for item in scenario.tags])}")
-    context.logger.info(f"Filename: {str(scenario.filename)}")
-    context.logger.info(f"Line: {str(scenario.line)}")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    emit_start(
+        context,
+        "scenario",
+        name=scenario.name,
+        tags=scenario.tags,
+        filename=scenario.filename,
+        line=scenario.line,
+    )
+
+    start_command_stream(
+        context, f"scenario {scenario.filename}:{scenario.line}"
+    )
+
+    context.scenario_deadline = create_deadline(
+        context,
+        f"scenario {scenario.name}",
+        "scenario_time_budget",
+        scenario.effective_tags,
     )
+    context.deadline = context.scenario_deadline
+
+    # The driver is kept between scenarios, so its state is not
+    clear_session_state(context)
 
     context.logger.info(f"Opening application url '{context.application_url}'")
     context.driver.get(context.application_url)
     context.driver.maximize_window()
+    capture_page_performance(context, scenario.name)
 
     context.element_action = ElementAction(context)
 
 
+def before_step(context, step) -> None:
+    """
+    Start the step time budget, nested in the scenario one
+    Args:
+        - context: Holds contextual information during the running of tests
+        - step: Holds contextual information about step during the running of tests
+    """
+    emit_start(
+        context,
+        "step",
+        keyword=step.keyword,
+        name=step.name,
+        line=step.line,
+    )
+
+    context.deadline = create_deadline(
+        context,
+        f"step {step.name}",
+        "step_time_budget",
+        context.scenario.effective_tags,
+        parent=context.scenario_deadline,
+    )
+
+
 def after_step(context, step) -> None:
     """
     Save screenshot in case of test step failure
@@ -119,13 +203,16 @@ def after_step(context, step) -> None:
     if step.status == "failed":
         context.logger.info(f"{step.name}: FAILED, Line: {str(step.line)}")
 
+        if context.deadline is not None and context.deadline.is_exceeded():
+            context.logger.info(context.deadline.breakdown())
+
         try:
-            if not os.path.exists("screenshots"):
-                os.makedirs("screenshots")
+            if not os.path.exists(constants.SCREENSHOTS_DIR):
+                os.makedirs(constants.SCREENSHOTS_DIR)
 
             __current_scenario_name = context.scenario.name.split("--")[0]
             __screenshot_file_name = (
-                f"screenshots{os.path.sep}{__current_scenario_name.replace(' ', '_')}-"
+                f"{constants.SCREENSHOTS_DIR}{os.path.sep}{__current_scenario_name.replace(' ', '_')}-"
                 f"{strftime('%Y-%m-%d_%H-%M-%S')}.png"
             )
 
@@ -141,45 +228,42 @@ def after_step(context, step) -> None:
     else:
         context.logger.info(f"{step.name}: PASSED")
 
+    capture_page_performance(context, context.scenario.name)
+
+    context.deadline = context.scenario_deadline
+
+    emit_finish(
+        context,
+        "step",
+        status=step.status.name,
+        error=str(step.exception) if step.exception else None,
+    )
+
 
 def after_scenario(context, scenario) -> None:
     """
-    Close browser and quit driver
+    Stop commands stream and recycle driver if needed
     Args:
         - context: Holds contextual information during the running of tests
         - scenario: Holds contextual information about scenario during the running of tests
     """
 
-    context.logger.info("\n")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
-    )
-    context.logger.info(
-        f"FINISHED EXECUTION OF SCENARIO: {str(scenario.name)}"
-    )
-    context.logger.info(f"Result: {scenario.status}")
-    context.logger.info(
-        f"Time taken: {str('{0:.2f}'.format(scenario.duration / 60))} mins, "
-        f"{str('{0:.2f}'.format(scenario.duration % 60))} secs"
-    )
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    log_banner(
+        context,
+        [
+            f"FINISHED EXECUTION OF SCENARIO: {str(scenario.name)}",
+            f"Result: {scenario.status}",
+            f"Time taken: {str('{0:.2f}'.format(scenario.duration / 60))} mins, "
+            f"{str('{0:.2f}'.format(scenario.duration % 60))} secs",
+        ],
     )
+    emit_finish(context, "scenario", status=scenario.status.name)
 
-    if context.driver is not None:
-        try:
-            context.driver.close()
-        except Exception as e:
-            context.logger.error(
-                f"Unable to close browser window!" f"Error: {e}", exc_info=True
-            )
+    stop_command_stream(context)
 
-        # try:
-        #     context.driver.quit()
-        # except Exception as e:
-        #     context.logger.error(
-        #         f"Unable to quit driver!" f"Error: {e}", exc_info=True
-        #     )
+    # The driver is kept between scenarios and quit on after_all. The watchdog
+    # recycles it when the thresholds settled on behave.ini are reached.
+    context.watchdog.after_scenario()
 
 
 def after_feature(context, feature):
@@ -190,19 +274,18 @@ def after_feature(context, feature):
         - feature: Holds contextual information about feature during the running of tests
     """
 
-    context.logger.info("\n")
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
-    )
-    context.logger.info(f"FINISHED EXECUTION OF FEATURE: {str(feature.name)}")
-    context.logger.info(f"Result: {feature.status}")
-    context.logger.info(
-        f"Time taken: {str('{0:.2f}'.format(feature.duration / 60))} mins, "
-        f"{str('{0:.2f}'.format(feature.duration % 60))} secs"
-    )
-    context.logger.info(
-        "---------------------------------------------------------------------------------------------"
+    log_banner(
+        context,
+        [
+            f"FINISHED EXECUTION OF FEATURE: {str(feature.name)}",
+            f"Result: {feature.status}",
+            f"Time taken: {str('{0:.2f}'.format(feature.duration / 60))} mins, "
+            f"{str('{0:.2f}'.format(feature.duration % 60))} secs",
+        ],
     )
+    emit_finish(context, "feature", status=feature.status.name)
+    if context.events is not None:
+        context.events.flush()
 
 
 def after_all(context):
@@ -212,17 +295,265 @@ def after_all(context):
         - context: Holds contextual information during the running of tests
     """
 
-    context.logger.info("\n")
-    context.logger.info(
-        "============================================================================================="
+    if context.interaction_cache is not None:
+        context.interaction_cache.save()
+
+    if context.locator_profiler is not None:
+        report = context.locator_profiler.write_report(
+            constants.LOCATOR_PROFILE_REPORT
+        )
+        context.logger.info(
+            f"Locator profile report is saved in file "
+            f"'{constants.LOCATOR_PROFILE_REPORT}'"
+        )
+        for entry in report[:10]:
+            suggestion = entry["suggestion"]
+            context.logger.info(
+                f"{entry['name'] or '-'} {entry['strategy']} "
+                f"{entry['locator']}: {entry['lookups']} lookups, "
+                f"{entry['total_ms']} ms"
+                + (
+                    f", try {suggestion['strategy']} {suggestion['locator']} "
+                    f"({suggestion['speedup']}x faster)"
+                    if suggestion
+                    else ""
+                )
+            )
+
+    if context.page_performance is not None:
+        report_page_performance(context)
+
+    if WarmSession.active:
+        # Kept for the next run, quit when watch mode is interrupted
+        WarmSession.driver = context.driver
+    else:
+        context.watchdog.shutdown()
+
+    if context.events is not None:
+        context.events.emit("run_finished")
+        context.events.close()
+
+    log_banner(
+        context,
+        [f"TESTING FINISHED AT : {strftime('%Y-%m-%d %H:%M:%S')}"],
+        separator="=",
     )
+
+
+def is_enabled(context, key) -> bool:
+    """
+    Return whether a userdata flag is set as true on behave.ini
+    Args:
+        - context: Holds contextual information during the running of tests
+        - key: userdata key
+    """
+    return context.userdata.get(key, "") in [True, "true", "True", "TRUE", "1"]
+
+
+def create_deadline(context, name, key, tags, parent=None):
+    """
+    Create the deadline configured for a scenario or step, if any.
+    Invalid budgets are logged and ignored, returning parent.
+    Args:
+        - context: Holds contextual information during the running of tests
+        - name: name shown on the time breakdown
+        - key: tag and userdata key holding the budget in seconds
+        - tags: tags of the scenario running
+        - parent: deadline in which this one is nested
+    """
+    try:
+        return Deadline.from_settings(
+            name, key, tags, context.userdata, parent=parent
+        )
+    except ValueError as e:
+        context.logger.error(f"Ignoring time budget of {name}. Error: {e}")
+        return parent
+
+
+def log_banner(context, lines, separator="-") -> None:
+    """
+    Log lines between separator rows, unless 'log_banners' is false
+    Args:
+        - context: Holds contextual information during the running of tests
+        - lines: lines to log
+        - separator: character of the separator rows
+    """
+    if not context.log_banners:
+        return
+    context.logger.info("\n")
+    context.logger.info(separator * 93)
+    for line in lines:
+        context.logger.info(line)
+    context.logger.info(separator * 93)
+
+
+def emit_start(context, kind, **fields) -> None:
+    """
+    Write the start of a feature, scenario or step on the event stream
+    Args:
+        - context: Holds contextual information during the running of tests
+        - kind: 'feature', 'scenario' or 'step'
+        - fields: fields of the record
+    """
+    if context.events is not None:
+        context.events.start(kind, **fields)
+
+
+def emit_finish(context, kind, **fields) -> None:
+    """
+    Write the end of a feature, scenario or step on the event stream
+    Args:
+        - context: Holds contextual information during the running of tests
+        - kind: 'feature', 'scenario' or 'step'
+        - fields: fields of the record
+    """
+    if context.events is not None:
+        context.events.finish(kind, **fields)
+
+
+def start_driver(context):
+    """
+    Create driver for the browser specified in config file
+    Args:
+        - context: Holds contextual information during the running of tests
+    """
+    driver_factory = SeleniumDriverFactory(context)
+
+    driver = driver_factory.get_driver()
+
+    # Set driver implicit timeout. Webdriver will keep polling for the element for the specified timeout
+    # period.
+    timeout = int(context.userdata.get("implicit_timeout", ""))
+
+    driver.implicitly_wait(timeout)
+    context.logger.info(f"Driver implicit timeout is set to {str(timeout)}")
+    return driver
+
+
+def clear_session_state(context) -> None:
+    """
+    Delete cookies and local and session storage left by the previous
+    scenario on the page the driver is showing, before opening the
+    application again.
+    Args:
+        - context: Holds contextual information during the running of tests
+    """
+    try:
+        context.driver.delete_all_cookies()
+        context.driver.execute_script(java_script.CLEAR_STORAGE)
+    except Exception as e:
+        context.logger.error(
+            f"Unable to clear session state!" f"Error: {e}", exc_info=True
+        )
+
+
+def reuse_warm_driver(context):
+    """
+    Return the driver kept by the previous watch mode run, if it still
+    responds, or None.
+    Args:
+        - context: Holds contextual information during the running of tests
+    """
+    driver, WarmSession.driver = WarmSession.driver, None
+    if driver is None:
+        return None
+    try:
+        driver.current_url
+    except Exception as e:
+        context.logger.info(f"Warm driver is gone, starting a new one: {e}")
+        return None
+    context.logger.info("Reusing warm driver")
+    return driver
+
+
+def start_command_stream(context, name) -> None:
+    """
+    Start recording or replaying WebDriver commands on a new stream, when
+    'record_commands' or 'replay_commands' is on
+    Args:
+        - context: Holds contextual information during the running of tests
+        - name: name of the stream
+    """
+    command_executor = context.driver.command_executor
+    if isinstance(command_executor, CommandStream):
+        command_executor.start(name, context.driver)
+        context.logger.info(
+            f"Commands stream '{command_executor.path(name)}' started"
+        )
+
+
+def stop_command_stream(context) -> None:
+    """
+    Stop recording or replaying WebDriver commands
+    Args:
+        - context: Holds contextual information during the running of tests
+    """
+    command_executor = context.driver.command_executor
+    if isinstance(command_executor, CommandStream):
+        command_executor.stop()
+
+
+def capture_page_performance(context, name) -> None:
+    """
+    Capture timings of the current page when 'capture_page_performance' is on
+    Args:
+        - context: Holds contextual information during the running of tests
+        - name: name of the feature or scenario running
+    """
+    if context.page_performance is None:
+        return
+    try:
+        timings = context.page_performance.capture(context.driver, name)
+        if timings is not None:
+            context.logger.info(
+                f"Page performance of '{timings['page']}': "
+                f"ttfb {timings['ttfb']:.0f} ms, load {timings['load']:.0f} ms"
+            )
+    except Exception as e:
+        context.logger.error(
+            f"Unable to capture page performance!" f"Error: {e}", exc_info=True
+        )
+
+
+def report_page_performance(context) -> None:
+    """
+    Save page timings and flag regressions against the stored baseline
+    Args:
+        - context: Holds contextual information during the running of tests
+    """
+    page_performance = context.page_performance
+    page_performance.write(constants.PAGE_PERFORMANCE_REPORT)
     context.logger.info(
-        f"TESTING FINISHED AT : {strftime('%Y-%m-%d %H:%M:%S')}"
+        f"Page performance report is saved in file "
+        f"'{constants.PAGE_PERFORMANCE_REPORT}'"
     )
-    context.logger.info(
-        "============================================================================================="
+
+    # Relative baselines are kept on the artifacts namespace of the run,
+    # so every browser of a matrix run is compared with its own timings
+    baseline_file = os.path.join(
+        constants.ARTIFACTS_DIR,
+        context.userdata.get("performance_baseline", "")
+        or constants.PAGE_PERFORMANCE_BASELINE,
     )
-    context.logger.info("\n")
+    baseline = page_performance.load_baseline(baseline_file)
+    if baseline is not None:
+        threshold_percent = context.userdata.get(
+            "performance_threshold_percent", ""
+        )
+        threshold_ms = context.userdata.get("performance_threshold_ms", "")
+        regressions = page_performance.compare(
+            baseline, float(threshold_percent or 20), float(threshold_ms or 50)
+        )
+        for regression in regressions:
+            context.logger.warning(
+                f"PERFORMANCE REGRESSION on '{regression['page']}': "
+                f"{regression['metric']} took {regression['value']} ms, "
+                f"baseline is {regression['baseline']} ms"
+            )
+
+    if baseline is None or is_enabled(context, "update_performance_baseline"):
+        page_performance.save_baseline(baseline_file)
+        context.logger.info(f"Performance baseline saved in '{baseline_file}'")
 
 
 def setup_logger():
@@ -232,5 +563,9 @@ def setup_logger():
     with open(constants.LOGGER_CONFIG, "rt") as f:
         options = load(f)
 
+    # Keep the log file on the artifacts namespace of the run
+    options["handlers"]["debug_file_handler"]["filename"] = os.path.join(
+        constants.LOG_FILE_DIR, "log.log"
+    )
     config.dictConfig(options)
     return getLogger(__name__)
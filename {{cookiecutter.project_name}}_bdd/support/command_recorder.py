@@ -0,0 +1,275 @@
+import gzip
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from json import dumps, loads
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from selenium.webdriver.support import wait
+
+from {{cookiecutter.project_name}}_bdd.support.core.deadline import Deadline
+
+
+class ReplayMismatch(WebDriverException):
+    """
+    Raised when a replayed scenario sends a command other than the recorded.
+    """
+
+
+class VirtualClock(object):
+    """
+    Clock of replays. It starts at the current time and moves forward only
+    by the time slept and by the elapsed time recorded for each command, so
+    waits and time budgets behave as recorded, at CPU speed.
+    """
+
+    def __init__(self):
+        self._time = time.time()
+        self._monotonic = time.monotonic()
+        self.elapsed = 0.0
+
+    def time(self) -> float:
+        return self._time + self.elapsed
+
+    def monotonic(self) -> float:
+        return self._monotonic + self.elapsed
+
+    def sleep(self, seconds) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds) -> None:
+        self.elapsed += max(seconds, 0)
+
+
+class CommandStream(ABC):
+    """
+    Base class for the command executors that record and replay WebDriver
+    commands. Commands are split in streams, one per feature or scenario,
+    saved as gzipped json lines on 'directory'.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.name = None
+
+    def path(self, name) -> str:
+        """
+        Return the file of the stream.
+        Args:
+            - name: feature or scenario the stream belongs to
+        """
+        file_name = re.sub(r"[^\w.-]+", "_", name)
+        return os.path.join(self.directory, f"{file_name}.jsonl.gz")
+
+    @abstractmethod
+    def start(self, name, driver) -> None:
+        """
+        Start the stream of a feature or scenario.
+        """
+        ...
+
+    @abstractmethod
+    def stop(self) -> None:
+        """
+        Stop the current stream.
+        """
+        ...
+
+
+class CommandRecorder(CommandStream):
+    """
+    Command executor that forwards every command to the real one and saves
+    it, along with its response and elapsed time, on the current stream.
+    The first line of each stream holds the session capabilities.
+    """
+
+    def __init__(self, command_executor, directory):
+        super().__init__(directory)
+        self.command_executor = command_executor
+        self._file = None
+
+    def __getattr__(self, name):
+        if name == "command_executor":
+            raise AttributeError(name)
+        return getattr(self.command_executor, name)
+
+    def start(self, name, driver) -> None:
+        """
+        Start saving commands on a new stream.
+        Args:
+            - name: feature or scenario the stream belongs to
+            - driver: webdriver whose commands are recorded
+        """
+        self.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        self.name = name
+        self._file = gzip.open(self.path(name), "wt", encoding="utf8")
+        self._file.write(
+            dumps({"w3c": driver.w3c, "capabilities": driver.capabilities})
+            + "\n"
+        )
+
+    def stop(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.name = None
+
+    def execute(self, command, params):
+        started_at = time.perf_counter()
+        response = self.command_executor.execute(command, params)
+        if self._file is not None:
+            self._file.write(
+                dumps(
+                    {
+                        "command": command,
+                        "params": _without_session(params),
+                        "response": response,
+                        "elapsed": round(time.perf_counter() - started_at, 6),
+                    },
+                    separators=(",", ":"),
+                    default=str,
+                )
+                + "\n"
+            )
+        return response
+
+
+class CommandReplayer(CommandStream):
+    """
+    Command executor that answers commands with the responses of a recorded
+    stream, without any browser. Commands sent outside a stream, i.e. on
+    before_all and after_all, succeed with an empty response.
+    Waits poll by wall-clock time and replayed responses are instant, so
+    a command repeated beyond the recorded polls gets the last response
+    again, and recorded polls not repeated on replay are skipped.
+    Timeouts commands are matched by name only, as their values depend on
+    the time budget left. When a clock is given, every answer advances it by
+    the elapsed time recorded for the command.
+    """
+
+    loose_commands = [Command.SET_TIMEOUTS, Command.IMPLICIT_WAIT]
+
+    def __init__(self, directory, clock=None):
+        super().__init__(directory)
+        self.clock = clock
+        self.w3c = True
+        self._records = []
+        self._position = 0
+        self._last = None
+
+    def start(self, name, driver) -> None:
+        """
+        Load the recorded stream to be replayed.
+        Args:
+            - name: feature or scenario the stream belongs to
+            - driver: replay webdriver
+        """
+        with gzip.open(self.path(name), "rt", encoding="utf8") as f:
+            session = loads(f.readline())
+            records = [loads(line) for line in f]
+        driver.w3c = self.w3c = session["w3c"]
+        driver.capabilities = session["capabilities"]
+        self.name = name
+        self._records = records
+        self._position = 0
+        self._last = None
+
+    def stop(self) -> None:
+        self.name = None
+        self._records = []
+        self._position = 0
+        self._last = None
+
+    def _matches(self, record, command, params) -> bool:
+        if record is None or record["command"] != command:
+            return False
+        return command in self.loose_commands or record["params"] == params
+
+    def _next(self):
+        if self._position < len(self._records):
+            return self._records[self._position]
+        return None
+
+    def _after_polls(self) -> int:
+        """
+        Return the position after the recorded repetitions of the last
+        command.
+        """
+        position = self._position
+        while position < len(self._records) and self._matches(
+            self._last,
+            self._records[position]["command"],
+            self._records[position]["params"],
+        ):
+            position += 1
+        return position
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            return {"value": {"sessionId": "replay", "capabilities": {}}}
+        if self.name is None:
+            return {"value": None}
+
+        params = loads(dumps(_without_session(params), default=str))
+        if not self._matches(self._next(), command, params):
+            if self._matches(self._last, command, params):
+                # Polled more times than recorded
+                return self._answer(self._last)
+            # Polled fewer times than recorded
+            self._position = self._after_polls()
+
+        record = self._next()
+        if record is None:
+            raise ReplayMismatch(
+                f"Stream '{self.name}' ended, but got command {command} "
+                f"{params}"
+            )
+        if not self._matches(record, command, params):
+            raise ReplayMismatch(
+                f"Stream '{self.name}' expected command {record['command']} "
+                f"{record['params']}, but got {command} {params}"
+            )
+        self._position += 1
+        self._last = record
+        return self._answer(record)
+
+    def _answer(self, record):
+        if self.clock is not None:
+            self.clock.advance(record.get("elapsed", 0))
+        return record["response"]
+
+
+class ReplayWebDriver(RemoteWebDriver):
+    """
+    Webdriver that replays recorded command streams instead of driving a
+    browser, so steps and ElementAction can be run and profiled offline.
+    Until it quits, WebDriverWait and Deadline run on its virtual clock, so
+    waits take no real time.
+    """
+
+    def __init__(self, directory):
+        self.clock = VirtualClock()
+        self._real_clocks = (wait.time, Deadline.clock)
+        wait.time = Deadline.clock = self.clock
+        super().__init__(
+            command_executor=CommandReplayer(directory, self.clock),
+            desired_capabilities={"browserName": "replay"},
+        )
+
+    def quit(self) -> None:
+        try:
+            super().quit()
+        finally:
+            wait.time, Deadline.clock = self._real_clocks
+
+
+def _without_session(params) -> dict:
+    return {
+        key: value
+        for key, value in (params or {}).items()
+        if key != "sessionId"
+    }
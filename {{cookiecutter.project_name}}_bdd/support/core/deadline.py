@@ -0,0 +1,142 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import time
+from math import inf
+
+
+class DeadlineExceeded(AssertionError):
+    """
+    Raised when the time budget of a step or scenario is spent.
+    It extends AssertionError so behave reports the step as failed.
+    """
+
+
+class Deadline(object):
+    """
+    Time budget shared by every wait performed while it is active.
+    A step deadline is nested in the scenario deadline, so waits are capped
+    by whichever of both budgets has less time remaining.
+    The budgets are settled through tags, i.e. '@scenario_time_budget=60' and
+    '@step_time_budget=10', or through the same keys on behave.ini userdata.
+    Time is read from 'clock', swapped by replays for a virtual one.
+    """
+
+    clock = time
+
+    def __init__(self, name, budget=None, parent=None):
+        self.name = name
+        self.budget = budget
+        self.parent = parent
+        self.started_at = self.clock.monotonic()
+        self.spent = []
+
+    @classmethod
+    def from_settings(cls, name, key, tags, userdata, parent=None):
+        """
+        Create a deadline when a budget is configured for it.
+        Returns parent when no budget is found.
+        Raises ValueError when the budget is not a positive number.
+        Args:
+            - name: name shown on the time breakdown
+            - key: tag and userdata key holding the budget in seconds
+            - tags: tags of the scenario running
+            - userdata: behave.ini userdata
+            - parent: deadline in which this one is nested
+        """
+        budget = userdata.get(key, "")
+        for tag in tags:
+            if tag.startswith(f"{key}="):
+                budget = tag.split("=", 1)[1]
+        if str(budget).strip() == "":
+            return parent
+        try:
+            seconds = float(budget)
+        except ValueError:
+            seconds = 0
+        if not seconds > 0:
+            raise ValueError(
+                f"Invalid '{key}' value '{budget}', expected a positive "
+                f"number of seconds"
+            )
+        return cls(name, seconds, parent)
+
+    def elapsed(self) -> float:
+        return self.clock.monotonic() - self.started_at
+
+    def _own_remaining(self) -> float:
+        if self.budget is None:
+            return inf
+        return self.budget - self.elapsed()
+
+    def remaining(self) -> float:
+        """
+        Return seconds left, considering the parent deadlines too.
+        """
+        remaining = self._own_remaining()
+        if self.parent is not None:
+            return min(remaining, self.parent.remaining())
+        return remaining
+
+    def is_exceeded(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """
+        Raise DeadlineExceeded with the time breakdown if budget is spent.
+        """
+        if self.is_exceeded():
+            raise DeadlineExceeded(self.breakdown())
+
+    def timeout(self, timeout) -> float:
+        """
+        Return timeout capped to the remaining budget.
+        Args:
+            - timeout: timeout, in seconds, the wait would use otherwise
+        """
+        self.check()
+        return min(timeout, self.remaining())
+
+    @contextmanager
+    def track(self, label):
+        """
+        Record the time spent on a block on this deadline and its parents.
+        Args:
+            - label: description of the block, shown on the breakdown
+        """
+        started_at = self.clock.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = self.clock.monotonic() - started_at
+            deadline = self
+            while deadline is not None:
+                deadline.spent.append((label, elapsed))
+                deadline = deadline.parent
+
+    def breakdown(self) -> str:
+        """
+        Return where the time of this deadline went, most expensive first.
+        """
+        exhausted = self
+        deadline = self.parent
+        while deadline is not None:
+            if deadline._own_remaining() < exhausted._own_remaining():
+                exhausted = deadline
+            deadline = deadline.parent
+
+        totals = defaultdict(float)
+        for label, elapsed in self.spent:
+            totals[label] += elapsed
+        lines = [
+            f"Time budget of {exhausted.budget:.2f}s for '{exhausted.name}' "
+            f"exceeded after {exhausted.elapsed():.2f}s. Time spent:"
+        ]
+        lines.extend(
+            f"  {elapsed:.2f}s - {label}"
+            for label, elapsed in sorted(
+                totals.items(), key=lambda item: item[1], reverse=True
+            )
+        )
+        untracked = self.elapsed() - sum(totals.values())
+        lines.append(f"  {max(untracked, 0):.2f}s - outside element actions")
+        return "\n".join(lines)
@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
@@ -7,11 +11,46 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 
+from {{cookiecutter.project_name}}_bdd.support.core import java_script
+from {{cookiecutter.project_name}}_bdd.support.core.deadline import DeadlineExceeded
 from {{cookiecutter.project_name}}_bdd.utils.assert_utils import Assert
 
 
+def action_event(method):
+    """
+    Write an 'action' record on 'context.events', when the event stream is
+    on, with the action name, its first argument, status and duration.
+    Actions called by other actions are not recorded.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        events = getattr(self.context, "events", None)
+        if events is None or self._action_depth:
+            return method(self, *args, **kwargs)
+
+        self._action_depth += 1
+        started_at = perf_counter()
+        status = "failed"
+        try:
+            result = method(self, *args, **kwargs)
+            status = "passed"
+            return result
+        finally:
+            self._action_depth -= 1
+            events.emit(
+                "action",
+                action=method.__name__,
+                target=args[0] if args else None,
+                status=status,
+                duration=round(perf_counter() - started_at, 3),
+            )
+
+    return wrapper
+
+
 class ElementAction(object):
     """
     Action class to perform basic operations on webpage elements.
@@ -30,6 +69,65 @@ class ElementAction(object):
 
     def __init__(self, context):
         self.context = context
+        self._select_options = {}
+        self._action_depth = 0
+
+    @staticmethod
+    def split_locator(locator) -> tuple:
+        """
+        Return locator as a (strategy, locator) tuple.
+        Args:
+            - locator: element locator, as tuple or 'STRATEGY, locator' string
+        """
+        if isinstance(locator, str):
+            strategy, actual_locator = locator.split(",", 1)
+            return strategy.strip(), actual_locator.strip()
+        return tuple(locator)
+
+    def _timeout(self, timeout=None) -> float:
+        """
+        Return the timeout for a wait, capped by the active step or scenario
+        deadline, if any.
+        Args:
+            - timeout: It overrides 'element_fetch_timeout', settled in behave.ini
+        """
+        if timeout is None:
+            timeout = int(
+                self.context.userdata.get("element_fetch_timeout", "")
+            )
+        deadline = getattr(self.context, "deadline", None)
+        if deadline is None:
+            return timeout
+        return deadline.timeout(timeout)
+
+    @contextmanager
+    def _track(self, label):
+        """
+        Record the time spent on a block on the active deadline, if any.
+        Meanwhile, when less budget remains than the implicit wait of the
+        driver, the implicit wait is capped to it, so no lookup inside the
+        block blocks past the deadline.
+        Args:
+            - label: description of the block, shown on the time breakdown
+        """
+        deadline = getattr(self.context, "deadline", None)
+        if deadline is None:
+            yield
+            return
+
+        implicit_timeout = int(
+            self.context.userdata.get("implicit_timeout", "") or 0
+        )
+        remaining = deadline.remaining()
+        capped = remaining < implicit_timeout
+        if capped:
+            self.context.driver.implicitly_wait(max(remaining, 0))
+        try:
+            with deadline.track(label):
+                yield
+        finally:
+            if capped:
+                self.context.driver.implicitly_wait(implicit_timeout)
 
     def fetch_element(
         self, locator, is_list_of_elements=False, element_timeout=None
@@ -42,13 +140,9 @@ class ElementAction(object):
             - is_list_of_elements: when locator returns multiple elements, you should set it to True
             - element_timeout: It overrides 'element_fetch_timeout', settled in behave.ini.
         """
-        strategy = locator[0]
-        actual_locator = locator[1]
+        strategy, actual_locator = self.split_locator(locator)
 
-        if element_timeout is None:
-            element_timeout = int(
-                self.context.userdata.get("element_fetch_timeout", "")
-            )
+        element_timeout = self._timeout(element_timeout)
         try:
             if strategy not in ElementAction.locator_strategies:
                 raise KeyError(
@@ -56,11 +150,14 @@ class ElementAction(object):
                     f"Attempted Strategy : {strategy}"
                 )
             try:
-                WebDriverWait(self.context.driver, element_timeout).until(
-                    EC.visibility_of_element_located(
-                        (getattr(By, strategy), actual_locator)
+                with self._track(
+                    f"wait visibility of {strategy} {actual_locator}"
+                ):
+                    WebDriverWait(self.context.driver, element_timeout).until(
+                        EC.visibility_of_element_located(
+                            (getattr(By, strategy), actual_locator)
+                        )
                     )
-                )
             except (TimeoutException, StaleElementReferenceException):
                 self.context.logger.error(
                     f"Timed out after {str(element_timeout)} seconds waiting for element"
@@ -68,16 +165,14 @@ class ElementAction(object):
                     exc_info=True,
                 )
 
+            # Fail fast once the budget was spent on the wait above
+            self._timeout(element_timeout)
+
             if is_list_of_elements:
-                return self.context.driver.find_elements(
-                    getattr(By, strategy), actual_locator
-                )
+                return self._find(strategy, actual_locator, True)
 
             try:
-                element = self.context.driver.find_element(
-                    getattr(By, strategy), actual_locator
-                )
-                return element
+                return self._find(strategy, actual_locator)
             except TypeError:
                 return False
 
@@ -88,6 +183,34 @@ class ElementAction(object):
                 f"Locator: {str(actual_locator)}"
             )
 
+    def _find(self, strategy, actual_locator, is_list_of_elements=False):
+        """
+        Look the locator up, recording the time spent on the active deadline
+        and, when profiling locators, on 'locator_profiler'.
+        """
+        find = (
+            self.context.driver.find_elements
+            if is_list_of_elements
+            else self.context.driver.find_element
+        )
+        with self._track(f"find {strategy} {actual_locator}"):
+            started_at = perf_counter()
+            found = find(getattr(By, strategy), actual_locator)
+            elapsed = perf_counter() - started_at
+
+        profiler = getattr(self.context, "locator_profiler", None)
+        if profiler is not None:
+            # Timing the alternatives spends budget too, shown on its own
+            with self._track(f"profile {strategy} {actual_locator}"):
+                profiler.record(
+                    self.context.driver,
+                    (strategy, actual_locator),
+                    elapsed,
+                    None if is_list_of_elements else found,
+                )
+        return found
+
+    @action_event
     def is_element_present(
         self, locator, replacement=None, timeout=None
     ) -> bool:
@@ -107,6 +230,7 @@ class ElementAction(object):
         except NoSuchElementException:
             return False
 
+    @action_event
     def is_element_displayed(
         self, locator, replacement=None, timeout=None
     ) -> bool:
@@ -128,29 +252,110 @@ class ElementAction(object):
             return self.fetch_element(
                 locator, is_list_of_elements=timeout
             ).is_displayed()
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
-    def is_text_present(self, text) -> bool:
+    @action_event
+    def find_text(
+        self,
+        text,
+        container=None,
+        regex=False,
+        ignore_case=False,
+        timeout=None,
+    ) -> dict:
+        """
+        Search text inside the browser and return the match and its location.
+        Only the search result crosses the WebDriver wire, not the page text.
+        The result holds 'found', 'container_found' and, when found, 'match',
+        'index', 'tag', 'id', 'x', 'y', 'width' and 'height' of the innermost
+        element containing the text.
+        Args:
+            - text: text, or regular expression when regex is True, to search
+            - container: locator of the element to search in, defaults to body
+            - regex: whether text is a java script regular expression
+            - ignore_case: whether the search is case insensitive
+            - timeout: seconds to keep searching until the text appears
+        """
+        script_args = (
+            text,
+            list(self.split_locator(container)) if container else None,
+            regex,
+            ignore_case,
+        )
+        if not timeout:
+            return self.execute_java_script(
+                java_script.FIND_TEXT, *script_args
+            )
+
+        result = {"found": False, "container_found": False}
+
+        def text_found(driver):
+            result.update(
+                driver.execute_script(java_script.FIND_TEXT, *script_args)
+            )
+            return result["found"]
+
+        try:
+            timeout = self._timeout(timeout)
+            with self._track(f"wait text {text}"):
+                WebDriverWait(self.context.driver, timeout).until(text_found)
+        except TimeoutException:
+            self.context.logger.info(
+                f"Timed out after {str(timeout)} seconds waiting for text "
+                f"{text}"
+            )
+        return result
+
+    @action_event
+    def is_text_present(
+        self,
+        text,
+        container=None,
+        regex=False,
+        ignore_case=False,
+        timeout=None,
+    ) -> bool:
         """
         Verify if text is present on webpage.
         Args:
              - text: text to verify
+             - container: locator of the element to search in, defaults to body
+             - regex: whether text is a java script regular expression
+             - ignore_case: whether the search is case insensitive
+             - timeout: seconds to keep searching until the text appears
         """
         try:
-            body = self.fetch_element("TAG_NAME, body")
-            is_text_present_in_body = text in body.text
-
-            if is_text_present_in_body:
-                self.context.logger.info(f"Body contains text {text}")
+            result = self.find_text(
+                text,
+                container=container,
+                regex=regex,
+                ignore_case=ignore_case,
+                timeout=timeout,
+            )
+            if result["found"]:
+                self.context.logger.info(
+                    f"Page contains text {text} at element {result['tag']}"
+                )
+            elif not result["container_found"]:
+                self.context.logger.info(
+                    f"Unable to find container {container} to search text "
+                    f"{text}"
+                )
             else:
-                self.context.logger.info(f"Body does not contains text {text}")
-            return is_text_present_in_body
+                self.context.logger.info(f"Page does not contain text {text}")
+            return result["found"]
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to check presence of text {text} on page. Error {e}"
             )
+            return False
 
+    @action_event
     def is_element_checked(
         self, locator, replacement=None, timeout=None
     ) -> bool:
@@ -172,6 +377,8 @@ class ElementAction(object):
                 f"{str(is_element_checked)}"
             )
             return is_element_checked
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to check checked status for element {locator}"
@@ -179,11 +386,15 @@ class ElementAction(object):
             )
             return False
 
+    @action_event
     def click(
         self, locator, replacement=None, click_using_java_script=False
     ) -> None:
         """
         Click on element.
+        Tries a native click first, falling back to Action Chains.
+        When 'interaction_cache' is enabled on context, java script is the
+        last fallback and the strategy that worked is tried first next time.
         Args:
             - locator: locator on which to click
             - replacement: if locator contains dynamic part, i.e. '$value',
@@ -192,54 +403,67 @@ class ElementAction(object):
         """
         if replacement is not None:
             locator = locator.replace("$value", replacement)
+        locator = self.split_locator(locator)
+        cache = getattr(self.context, "interaction_cache", None)
+
         if click_using_java_script:
-            _ele = self.fetch_element(locator)
-            self.execute_java_script("arguments[0].click();", _ele)
-            self.context.logger.info(
-                f"Clicked on element {locator} using java script"
-            )
+            strategies = ["java_script"]
+        elif cache is None:
+            strategies = ["native", "action_chains"]
         else:
-            try:
-                strategy = locator.split(",")[0].strip()
-                actual_locator = locator.replace(f"{strategy},", "")
-                timeout = int(
-                    self.context.userdata.get("element_fetch_timeout", "")
-                )
-
-                WebDriverWait(self.context.driver, timeout).until(
-                    EC.element_to_be_clickable(
-                        (getattr(By, strategy), actual_locator)
-                    )
-                )
+            strategies = cache.strategies_for(locator)
 
-                _ele = self.fetch_element(locator)
-                _ele.click()
-                self.context.logger.info(f"Clicked on element {locator}")
+        for strategy in strategies:
+            try:
+                getattr(self, f"_click_{strategy}")(locator)
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 self.context.logger.info(
-                    f"Unable to click on element {locator}."
+                    f"Unable to click on element {locator} using {strategy}."
                     f"Error: {e}"
-                    f"Trying to click using Action Chains."
                 )
-                try:
-                    element = self.fetch_element(locator)
+                if cache is not None:
+                    cache.record_failure(locator, strategy)
+                continue
 
-                    actions = ActionChains(self.context.driver)
-                    actions.move_to_element(element)
-                    actions.click(element)
-                    actions.perform()
+            if cache is not None:
+                cache.record_success(locator, strategy)
+            self.context.logger.info(
+                f"Clicked on element {locator} using {strategy}"
+            )
+            return
 
-                    self.context.logger.info(
-                        f"Action Chains - Clicked on element {locator}"
-                    )
-                except Exception as e:
-                    self.context.logger.error(
-                        f"Unable to click on element {locator}." f"Error: {e}",
-                        exc_info=True,
-                    )
-                    Assert.assert_fail(f"Unable to click on element {locator}")
+        self.context.logger.error(f"Unable to click on element {locator}.")
+        Assert.assert_fail(f"Unable to click on element {locator}")
+
+    def _click_native(self, locator) -> None:
+        strategy, actual_locator = locator
+        timeout = self._timeout()
+
+        with self._track(f"wait clickable {strategy} {actual_locator}"):
+            WebDriverWait(self.context.driver, timeout).until(
+                EC.element_to_be_clickable(
+                    (getattr(By, strategy), actual_locator)
+                )
+            )
+        self.fetch_element(locator).click()
 
-    def type(self, locator, text, replacement=None) -> None:
+    def _click_action_chains(self, locator) -> None:
+        element = self.fetch_element(locator)
+
+        actions = ActionChains(self.context.driver)
+        actions.move_to_element(element)
+        actions.click(element)
+        actions.perform()
+
+    def _click_java_script(self, locator) -> None:
+        self.context.driver.execute_script(
+            "arguments[0].click();", self.fetch_element(locator)
+        )
+
+    @action_event
+    def type(self, locator, text, replacement=None, fast_fill=False) -> None:
         """
         Type text in locator.
         Args:
@@ -247,14 +471,23 @@ class ElementAction(object):
              - text: text to type
              - replacement: if locator contains dynamic part, i.e. '$value',
             it will be replaced by replacement variable
+             - fast_fill: whether to set the value at once using java script,
+            firing 'input' and 'change' events, instead of sending keystrokes
         """
         if replacement is not None:
             locator = locator.replace("$value", replacement)
         try:
             _element = self.fetch_element(locator)
-            _element.clear()
-            _element.send_keys(text)
-            self.context.info(f"Typed text {text} on element {locator}")
+            if fast_fill:
+                self.context.driver.execute_script(
+                    java_script.FILL_ELEMENT, _element, text
+                )
+            else:
+                _element.clear()
+                _element.send_keys(text)
+            self.context.logger.info(f"Typed text {text} on element {locator}")
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to type text {text} on element {locator}."
@@ -265,6 +498,50 @@ class ElementAction(object):
                 f"Unable to type text {text} on element {locator}"
             )
 
+    @action_event
+    def fill_form(self, fields, native_fields=None) -> None:
+        """
+        Fill many fields at once.
+        Once the first field is visible, fields are filled in a single java
+        script call, firing 'input' and 'change' events, except for
+        'native_fields', which are typed with real key events afterwards.
+        Args:
+            - fields: mapping of locator to text
+            - native_fields: locators, among fields, that need real key events
+        """
+        native_fields = [
+            self.split_locator(locator) for locator in native_fields or []
+        ]
+        fast_fields = []
+        for locator, text in fields.items():
+            locator = self.split_locator(locator)
+            if locator not in native_fields:
+                fast_fields.append([list(locator), text])
+
+        if not fast_fields:
+            missing = []
+        else:
+            # Wait for the form to be shown before filling it all at once
+            self.fetch_element(fast_fields[0][0])
+            missing = self.execute_java_script(
+                java_script.FILL_FORM, fast_fields
+            )
+        if missing:
+            self.context.logger.error(
+                f"Unable to fill form. Elements not found: {missing}"
+            )
+            Assert.assert_fail(
+                f"Unable to fill form. Elements not found: {missing}"
+            )
+        self.context.logger.info(
+            f"Filled form fields {[field[0] for field in fast_fields]}"
+        )
+
+        for locator, text in fields.items():
+            if self.split_locator(locator) in native_fields:
+                self.type(locator, text)
+
+    @action_event
     def submit(self, locator, replacement=None) -> None:
         """
         Submit a form.
@@ -282,6 +559,8 @@ class ElementAction(object):
             self.context.logger.info(
                 f"Submitted form clicking on element {locator}"
             )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to submit form clicking on element {locator}."
@@ -289,6 +568,7 @@ class ElementAction(object):
             )
             Assert.assert_fail("Unable to submit form!")
 
+    @action_event
     def get_text(self, locator, replacement=None) -> [str, None]:
         """
         Return text from locator.
@@ -305,6 +585,8 @@ class ElementAction(object):
                 f"Get text returned {element_text} for element {locator}"
             )
             return element_text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to get text from element {locator}" f"Error: {e}",
@@ -312,6 +594,79 @@ class ElementAction(object):
             )
             return None
 
+    @action_event
+    def get_snapshot(self, locators, attributes=None) -> dict:
+        """
+        Return text, value, visibility and attributes of several elements
+        fetched in a single java script call, repeated until any of them is
+        present or 'element_fetch_timeout' is reached.
+        Missing elements are reported as {"present": False, "visible": False}.
+        Args:
+            - locators: mapping of element name to locator
+            - attributes: names of html attributes to collect for each element
+        """
+        locators = {
+            name: self.split_locator(locator)
+            for name, locator in locators.items()
+        }
+        for strategy, _ in locators.values():
+            if strategy not in ElementAction.locator_strategies:
+                raise KeyError(
+                    "Unsupported locator strategy"
+                    f"Attempted Strategy : {strategy}"
+                )
+        script_args = (
+            {name: list(locator) for name, locator in locators.items()},
+            list(attributes or []),
+        )
+        snapshot = {}
+
+        def any_present(driver):
+            snapshot.update(
+                driver.execute_script(java_script.SNAPSHOT, *script_args)
+            )
+            return any(element["present"] for element in snapshot.values())
+
+        # Wait for the page to show the elements, as fetch_element would,
+        # without failing when all of them are missing
+        timeout = self._timeout()
+        try:
+            with self._track(f"wait snapshot {list(locators)}"):
+                WebDriverWait(self.context.driver, timeout).until(any_present)
+        except TimeoutException:
+            self.context.logger.info(
+                f"Timed out after {str(timeout)} seconds waiting for any of "
+                f"elements {list(locators)}"
+            )
+        self.context.logger.info(
+            f"Snapshot returned {snapshot} for elements {list(locators)}"
+        )
+        return snapshot
+
+    @action_event
+    def assert_snapshot(self, locators, expected, message=None) -> None:
+        """
+        Take a snapshot of the elements and assert it against the expected
+        values, reporting all mismatches together.
+        Args:
+            - locators: mapping of element name to locator
+            - expected: mapping or behave table, see 'Assert.assert_snapshot'
+            - message: message to be displayed in case of assertion fails
+        """
+        expected = Assert.parse_snapshot(expected)
+        attributes = {
+            field
+            for fields in expected.values()
+            for field in fields
+            if field not in ("present", "text", "visible", "value")
+        }
+        snapshot = self.get_snapshot(
+            {name: locators[name] for name in expected},
+            attributes=sorted(attributes),
+        )
+        Assert.assert_snapshot(snapshot, expected, message)
+
+    @action_event
     def check(self, locator, replacement=None) -> None:
         """
         Check element.
@@ -329,6 +684,8 @@ class ElementAction(object):
                 self.context.logger.info(
                     f"Checked checkbox having element {locator}"
                 )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to check locator {locator}" f"Error: {e}",
@@ -336,6 +693,7 @@ class ElementAction(object):
             )
             Assert.assert_fail(f"Unable to check locator {locator}")
 
+    @action_event
     def uncheck(self, locator, replacement=None) -> None:
         """
         Uncheck element.
@@ -353,6 +711,8 @@ class ElementAction(object):
                 self.context.logger.info(
                     f"Unchecked checkbox having element {locator}"
                 )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to uncheck locator {locator}." f"Error: {e}",
@@ -360,6 +720,7 @@ class ElementAction(object):
             )
             Assert.assert_fail(f"Unable to uncheck locator {locator}")
 
+    @action_event
     def get_title(self) -> [str, None]:
         """
         Return browser title.
@@ -375,18 +736,16 @@ class ElementAction(object):
             )
             return None
 
-    def execute_java_script(self, script, element=None) -> None:
+    def execute_java_script(self, script, *args):
         """
         Execute raw java script statements.
         Args:
             - script: java script to execute
-            - element: webdriver element on which to execute the java script
+            - args: webdriver elements or values available to the script
+            as 'arguments'
         """
         try:
-            if element:
-                return self.context.driver.execute_script(script, element)
-            else:
-                return self.context.driver.execute_script(script)
+            return self.context.driver.execute_script(script, *args)
         except Exception as e:
             self.context.logger.error(
                 f"Unable to execute java script {script}" f"Error: {e}",
@@ -394,6 +753,7 @@ class ElementAction(object):
             )
             Assert.assert_fail(f"Unable to execute java script {script}")
 
+    @action_event
     def select_by_visible_text(
         self,
         locator,
@@ -404,28 +764,104 @@ class ElementAction(object):
         Select an option by visible option text.
         Args:
             - locator: locator of select element
-            - option_text: option text by which to select the option
+            - option_text: option text by which to select the option, or a
+            list of them for multi-select elements
+            - replacement: if locator contains dynamic part, i.e. '$value',
+            it will be replaced by replacement variable
+        """
+        self._select(locator, "text", option_text, replacement)
+
+    @action_event
+    def select_by_value(self, locator, value, replacement=None) -> None:
+        """
+        Select an option by its value attribute.
+        Args:
+            - locator: locator of select element
+            - value: option value by which to select the option, or a list
+            of them for multi-select elements
             - replacement: if locator contains dynamic part, i.e. '$value',
             it will be replaced by replacement variable
-            - retry_by_browser_refresh: if set to True, when webdriver is not able to find any element,
-            it will refresh the browser and try to find it again.
+        """
+        self._select(locator, "value", value, replacement)
+
+    @action_event
+    def select_by_index(self, locator, index, replacement=None) -> None:
+        """
+        Select an option by its index.
+        Args:
+            - locator: locator of select element
+            - index: option index by which to select the option, or a list
+            of them for multi-select elements
+            - replacement: if locator contains dynamic part, i.e. '$value',
+            it will be replaced by replacement variable
+        """
+        self._select(locator, "index", index, replacement)
+
+    def _select(self, locator, by, options, replacement=None) -> None:
+        """
+        Look the options up and select them in a single java script call,
+        firing 'input' and 'change' events, instead of fetching each option
+        through WebDriver.
         """
         if replacement is not None:
             locator = locator.replace("$value", replacement)
+        if not isinstance(options, (list, tuple)):
+            options = [options]
         try:
-            select = Select(self.fetch_element(locator))
-            select.select_by_visible_text(option_text)
+            missing = self.context.driver.execute_script(
+                java_script.SELECT_OPTIONS,
+                self.fetch_element(locator),
+                by,
+                list(options),
+            )
+            if missing:
+                raise NoSuchElementException(
+                    f"Cannot locate options with {by} {missing}"
+                )
 
             self.context.logger.info(
-                f"Selected element {locator} by visible text {option_text}"
+                f"Selected element {locator} by {by} {options}"
             )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
-                f"Unable to select option {option_text}" f"Error: {e}",
+                f"Unable to select option {options}" f"Error: {e}",
                 exc_info=True,
             )
-            Assert.assert_fail(f"Unable to select option {option_text}")
+            Assert.assert_fail(f"Unable to select option {options}")
+
+    @action_event
+    def get_select_options(
+        self, locator, replacement=None, use_cache=False
+    ) -> list:
+        """
+        Return text, value and disabled state of all options of a select
+        element, read in a single java script call.
+        Args:
+            - locator: locator of select element
+            - replacement: if locator contains dynamic part, i.e. '$value',
+            it will be replaced by replacement variable
+            - use_cache: whether to reuse the options read before for the
+            same element on the same page url
+        """
+        if replacement is not None:
+            locator = locator.replace("$value", replacement)
+        key = (self.context.driver.current_url, self.split_locator(locator))
+        if use_cache and key in self._select_options:
+            return self._select_options[key]
+
+        options = self.execute_java_script(
+            java_script.GET_OPTIONS, self.fetch_element(locator)
+        )
+        self._select_options[key] = options
+        self.context.logger.info(
+            f"Get select options returned {len(options)} options for element "
+            f"{locator}"
+        )
+        return options
 
+    @action_event
     def press_key(self, locator, key, replacement=None) -> None:
         """
         Press keyboard key in locator.
@@ -440,6 +876,8 @@ class ElementAction(object):
         try:
             self.fetch_element(locator).send_keys(key)
             self.context.logger.info(f"Pressed key {key} on element {locator}")
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self.context.logger.error(
                 f"Unable to press key {key} on element {locator}"
@@ -0,0 +1,112 @@
+import os
+from json import dump, load
+
+
+class InteractionStrategyCache(object):
+    """
+    Remember, across runs, which click strategy worked for each locator.
+    Clicks on known locators go straight to the strategy that worked before.
+    A remembered strategy is replaced as soon as another one works in its
+    place, and forgotten after 'max_failures' runs where no strategy worked.
+    Every 'reprobe_every' uses the default order is tried again, so a
+    strategy remembered because of a transient issue, i.e. an overlay,
+    does not hide for good that the native click stopped working.
+    Supported strategies, in default order:
+        - native
+        - action_chains
+        - java_script
+    """
+
+    strategies = ["native", "action_chains", "java_script"]
+
+    def __init__(self, path, max_failures=2, reprobe_every=10):
+        self.path = path
+        self.max_failures = max_failures
+        self.reprobe_every = reprobe_every
+        self.entries = self._load()
+        self.changed = False
+
+    def _load(self) -> dict:
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "rt") as f:
+                return load(f)
+        except ValueError:
+            return {}
+
+    @staticmethod
+    def key(locator) -> str:
+        return f"{locator[0]}={locator[1]}"
+
+    def strategies_for(self, locator) -> list:
+        """
+        Return the strategies to try, the remembered one first, except on
+        re-probing uses.
+        Args:
+            - locator: element locator
+        """
+        entry = self.entries.get(self.key(locator))
+        if entry is None:
+            return list(self.strategies)
+        entry["uses"] = entry.get("uses", 0) + 1
+        self.changed = True
+        if entry["uses"] % self.reprobe_every == 0:
+            return list(self.strategies)
+        return [entry["strategy"]] + [
+            strategy
+            for strategy in self.strategies
+            if strategy != entry["strategy"]
+        ]
+
+    def record_success(self, locator, strategy) -> None:
+        """
+        Remember the strategy that worked for the locator.
+        Args:
+            - locator: element locator
+            - strategy: strategy that worked
+        """
+        key = self.key(locator)
+        entry = self.entries.get(key)
+        if strategy == self.strategies[0]:
+            if entry is not None:
+                del self.entries[key]
+                self.changed = True
+        elif entry is None or entry["strategy"] != strategy:
+            self.entries[key] = {
+                "strategy": strategy,
+                "failures": 0,
+                "uses": 0,
+            }
+            self.changed = True
+        elif entry["failures"]:
+            entry["failures"] = 0
+            self.changed = True
+
+    def record_failure(self, locator, strategy) -> None:
+        """
+        Count a failure of the remembered strategy, forgetting it once it
+        reaches 'max_failures'.
+        Args:
+            - locator: element locator
+            - strategy: strategy that failed
+        """
+        key = self.key(locator)
+        entry = self.entries.get(key)
+        if entry is None or entry["strategy"] != strategy:
+            return
+        entry["failures"] += 1
+        if entry["failures"] >= self.max_failures:
+            del self.entries[key]
+        self.changed = True
+
+    def save(self) -> None:
+        """
+        Persist the cache if it changed during the run.
+        """
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "wt") as f:
+            dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        self.changed = False
@@ -0,0 +1,304 @@
+"""
+    Java script snippets executed through 'ElementAction.execute_java_script'.
+
+    Scripts that receive locators share FIND_ELEMENTS, which resolves a
+    (strategy, locator) pair inside the browser using the same strategies
+    supported by 'ElementAction.locator_strategies'. It lets a single script
+    call work with several elements instead of one WebDriver round-trip each.
+"""
+
+FIND_ELEMENTS = r"""
+var findElements = function (locator, root) {
+    root = root || document;
+    var strategy = locator[0], value = locator[1], found = [], index;
+    var quoted = '"' + String(value).replace(/(["\\])/g, "\\$1") + '"';
+    var links = function (partial) {
+        return Array.prototype.filter.call(
+            root.querySelectorAll("a"),
+            function (link) {
+                var text = (link.innerText || link.textContent).trim();
+                return partial ? text.indexOf(value) !== -1 : text === value;
+            }
+        );
+    };
+    switch (strategy) {
+        case "XPATH":
+            var result = document.evaluate(
+                value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            for (index = 0; index < result.snapshotLength; index++) {
+                found.push(result.snapshotItem(index));
+            }
+            return found;
+        case "ID":
+            return Array.prototype.slice.call(
+                root.querySelectorAll("[id=" + quoted + "]")
+            );
+        case "NAME":
+            return Array.prototype.slice.call(
+                root.querySelectorAll("[name=" + quoted + "]")
+            );
+        case "CLASS_NAME":
+            return Array.prototype.slice.call(root.getElementsByClassName(value));
+        case "CSS_SELECTOR":
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case "TAG_NAME":
+            return Array.prototype.slice.call(root.getElementsByTagName(value));
+        case "LINK_TEXT":
+            return links(false);
+        case "PARTIAL_LINK_TEXT":
+            return links(true);
+    }
+    throw new Error("Unsupported locator strategy: " + strategy);
+};
+"""
+
+SNAPSHOT = (
+    FIND_ELEMENTS
+    + r"""
+var locators = arguments[0], attributes = arguments[1], snapshot = {};
+Object.keys(locators).forEach(function (name) {
+    var element = findElements(locators[name])[0];
+    if (!element) {
+        snapshot[name] = {present: false, visible: false};
+        return;
+    }
+    var style = window.getComputedStyle(element);
+    var rect = element.getBoundingClientRect();
+    var entry = {
+        present: true,
+        text: (element.innerText || element.textContent || "").trim(),
+        visible: style.display !== "none" && style.visibility !== "hidden"
+            && rect.width > 0 && rect.height > 0,
+        value: element.value === undefined ? null : element.value
+    };
+    attributes.forEach(function (attribute) {
+        entry[attribute] = element.getAttribute(attribute);
+    });
+    snapshot[name] = entry;
+});
+return snapshot;
+"""
+)
+
+FIND_TEXT = (
+    FIND_ELEMENTS
+    + r"""
+var text = arguments[0], container = arguments[1];
+var isRegex = arguments[2], ignoreCase = arguments[3];
+var root = container ? findElements(container)[0] : document.body;
+if (!root) {
+    return {found: false, container_found: false};
+}
+var pattern = isRegex ? new RegExp(text, ignoreCase ? "i" : "") : null;
+var needle = ignoreCase ? text.toLowerCase() : text;
+var search = function (value) {
+    if (pattern) {
+        var match = pattern.exec(value);
+        return match ? {index: match.index, match: match[0]} : null;
+    }
+    var index = (ignoreCase ? value.toLowerCase() : value).indexOf(needle);
+    return index === -1 ? null : {
+        index: index, match: value.substr(index, text.length)
+    };
+};
+var result = search(root.innerText || root.textContent || "");
+if (!result) {
+    return {found: false, container_found: true};
+}
+var element = root;
+var walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {
+    acceptNode: function (node) {
+        var tag = node.parentElement && node.parentElement.tagName;
+        return tag === "SCRIPT" || tag === "STYLE"
+            ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT;
+    }
+});
+while (walker.nextNode()) {
+    if (search(walker.currentNode.data)) {
+        element = walker.currentNode.parentElement;
+        break;
+    }
+}
+var rect = element.getBoundingClientRect();
+return {
+    found: true,
+    container_found: true,
+    match: result.match,
+    index: result.index,
+    tag: element.tagName.toLowerCase(),
+    id: element.id || null,
+    x: rect.left,
+    y: rect.top,
+    width: rect.width,
+    height: rect.height
+};
+"""
+)
+
+LOCATOR_CANDIDATES = r"""
+var element = arguments[0], candidates = [];
+var isUnique = function (selector) {
+    try {
+        return document.querySelectorAll(selector).length === 1;
+    } catch (e) {
+        return false;
+    }
+};
+if (element.id && isUnique("#" + CSS.escape(element.id))) {
+    candidates.push(["ID", element.id]);
+}
+var name = element.getAttribute("name");
+if (name && document.getElementsByName(name).length === 1) {
+    candidates.push(["NAME", name]);
+}
+var path = [], node = element;
+while (node && node.nodeType === 1) {
+    if (node !== element && node.id && isUnique("#" + CSS.escape(node.id))) {
+        path.unshift("#" + CSS.escape(node.id));
+        break;
+    }
+    var selector = node.tagName.toLowerCase();
+    var siblings = node.parentElement ? Array.prototype.filter.call(
+        node.parentElement.children,
+        function (sibling) { return sibling.tagName === node.tagName; }
+    ) : [node];
+    if (siblings.length > 1) {
+        selector += ":nth-of-type(" + (siblings.indexOf(node) + 1) + ")";
+    }
+    path.unshift(selector);
+    if (isUnique(path.join(" > "))) {
+        break;
+    }
+    node = node.parentElement;
+}
+candidates.push(["CSS_SELECTOR", path.join(" > ")]);
+return candidates;
+"""
+
+PAGE_TIMINGS = r"""
+var navigation = performance.getEntriesByType("navigation")[0];
+// Not finished loading yet: readyState is complete before loadEventEnd
+if (!navigation || !(navigation.loadEventEnd > 0)) {
+    return null;
+}
+var paint = {};
+performance.getEntriesByType("paint").forEach(function (entry) {
+    paint[entry.name] = entry.startTime;
+});
+var resources = performance.getEntriesByType("resource");
+return {
+    time_origin: performance.timeOrigin,
+    url: location.href,
+    dns: navigation.domainLookupEnd - navigation.domainLookupStart,
+    connect: navigation.connectEnd - navigation.connectStart,
+    ttfb: navigation.responseStart - navigation.startTime,
+    response: navigation.responseEnd - navigation.responseStart,
+    dom_interactive: navigation.domInteractive,
+    dom_content_loaded: navigation.domContentLoadedEventEnd,
+    load: navigation.loadEventEnd,
+    first_paint: paint["first-paint"] || null,
+    first_contentful_paint: paint["first-contentful-paint"] || null,
+    transfer_size: navigation.transferSize,
+    resources_count: resources.length,
+    resources_transfer_size: resources.reduce(function (total, entry) {
+        return total + (entry.transferSize || 0);
+    }, 0),
+    resources_end: resources.reduce(function (end, entry) {
+        return Math.max(end, entry.responseEnd);
+    }, 0),
+    slowest_resources: resources.slice().sort(function (a, b) {
+        return b.duration - a.duration;
+    }).slice(0, 5).map(function (entry) {
+        return {name: entry.name, duration: entry.duration};
+    })
+};
+"""
+
+SET_VALUE = r"""
+var setValue = function (element, value) {
+    var prototype = [
+        HTMLInputElement, HTMLTextAreaElement, HTMLSelectElement
+    ].filter(function (type) {
+        return element instanceof type;
+    }).map(function (type) {
+        return type.prototype;
+    })[0];
+    element.focus();
+    if (prototype) {
+        // Use the native setter so frameworks tracking the value notice it
+        Object.getOwnPropertyDescriptor(prototype, "value").set.call(
+            element, value
+        );
+    } else if (element.isContentEditable) {
+        element.textContent = value;
+    } else {
+        element.value = value;
+    }
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+};
+"""
+
+FILL_ELEMENT = (
+    SET_VALUE
+    + r"""
+setValue(arguments[0], arguments[1]);
+"""
+)
+
+FILL_FORM = (
+    FIND_ELEMENTS
+    + SET_VALUE
+    + r"""
+var missing = [];
+arguments[0].forEach(function (field) {
+    var element = findElements(field[0])[0];
+    if (element) {
+        setValue(element, field[1]);
+    } else {
+        missing.push(field[0]);
+    }
+});
+return missing;
+"""
+)
+
+SELECT_OPTIONS = r"""
+var select = arguments[0], by = arguments[1], wanted = arguments[2];
+if (wanted.length > 1 && !select.multiple) {
+    throw new Error("Select does not support multiple selection");
+}
+var missing = wanted.slice(), index, position;
+for (index = 0; index < select.options.length && missing.length; index++) {
+    var option = select.options[index];
+    var key = by === "text" ? option.text
+        : by === "value" ? option.value : index;
+    position = missing.indexOf(key);
+    if (position !== -1) {
+        option.selected = true;
+        missing.splice(position, 1);
+    }
+}
+if (missing.length === wanted.length) {
+    return missing;
+}
+select.dispatchEvent(new Event("input", {bubbles: true}));
+select.dispatchEvent(new Event("change", {bubbles: true}));
+return missing;
+"""
+
+GET_OPTIONS = r"""
+return Array.prototype.map.call(arguments[0].options, function (option) {
+    return {text: option.text, value: option.value, disabled: option.disabled};
+});
+"""
+
+CLEAR_STORAGE = r"""
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (error) {
+    // Pages without storage, i.e. about:blank, have nothing to clear
+}
+"""
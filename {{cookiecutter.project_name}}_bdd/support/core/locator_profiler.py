@@ -0,0 +1,135 @@
+import os
+from collections import defaultdict
+from importlib import import_module
+from json import dump
+from pkgutil import iter_modules
+from statistics import mean
+from time import perf_counter
+
+from selenium.webdriver.common.by import By
+
+from {{cookiecutter.project_name}}_bdd.support import locators
+from {{cookiecutter.project_name}}_bdd.support.core import java_script
+
+
+class LocatorProfiler(object):
+    """
+    Time every lookup made by 'ElementAction.fetch_element', by strategy and
+    locator. The first time an element is found, faster candidate locators
+    for it (its ID, NAME or a CSS path) are timed against the same live DOM.
+    The report ranks the most expensive locators, naming them after the
+    attributes of the modules under 'support/locators'.
+    """
+
+    def __init__(self, samples=3):
+        self.samples = samples
+        self.timings = defaultdict(list)
+        self.alternatives = {}
+
+    def record(self, driver, locator, elapsed, element=None) -> None:
+        """
+        Record the time of a lookup and time its alternatives once.
+        Args:
+            - driver: webdriver the lookup was made with
+            - locator: (strategy, locator) tuple looked up
+            - elapsed: seconds the lookup took
+            - element: element found, when a single one was looked up
+        """
+        locator = tuple(locator)
+        self.timings[locator].append(elapsed)
+        if element and locator not in self.alternatives:
+            self.alternatives[locator] = self._time_alternatives(
+                driver, locator, element
+            )
+
+    def _time_lookup(self, driver, locator) -> float:
+        timings = []
+        for _ in range(self.samples):
+            started_at = perf_counter()
+            driver.find_elements(getattr(By, locator[0]), locator[1])
+            timings.append(perf_counter() - started_at)
+        return mean(timings)
+
+    def _time_alternatives(self, driver, locator, element) -> dict:
+        try:
+            candidates = driver.execute_script(
+                java_script.LOCATOR_CANDIDATES, element
+            )
+            alternatives = {"baseline": self._time_lookup(driver, locator)}
+            for candidate in map(tuple, candidates):
+                if candidate == locator:
+                    continue
+                found = driver.find_elements(
+                    getattr(By, candidate[0]), candidate[1]
+                )
+                if found != [element]:
+                    continue
+                alternatives[candidate] = self._time_lookup(driver, candidate)
+            return alternatives
+        except Exception:
+            return {}
+
+    @staticmethod
+    def locator_names() -> dict:
+        """
+        Return the names of the locators declared on 'support/locators'
+        modules, i.e. {("ID", "nav-logo-sprites"): "base_page.nav_logo"}.
+        """
+        names = {}
+        for module_info in iter_modules(locators.__path__):
+            module = import_module(f"{locators.__name__}.{module_info.name}")
+            for attribute, value in vars(module).items():
+                if (
+                    isinstance(value, tuple)
+                    and len(value) == 2
+                    and value[0] in dir(By)
+                ):
+                    names[value] = f"{module_info.name}.{attribute}"
+        return names
+
+    def report(self) -> list:
+        """
+        Return locators ranked by total lookup time, with the fastest
+        alternative found for each of them.
+        """
+        names = self.locator_names()
+        entries = []
+        for locator, timings in self.timings.items():
+            entry = {
+                "name": names.get(locator),
+                "strategy": locator[0],
+                "locator": locator[1],
+                "lookups": len(timings),
+                "mean_ms": round(mean(timings) * 1000, 3),
+                "total_ms": round(sum(timings) * 1000, 3),
+                "suggestion": None,
+            }
+            alternatives = dict(self.alternatives.get(locator, {}))
+            baseline = alternatives.pop("baseline", None)
+            if alternatives:
+                candidate, candidate_time = min(
+                    alternatives.items(), key=lambda item: item[1]
+                )
+                if candidate_time < baseline:
+                    entry["suggestion"] = {
+                        "strategy": candidate[0],
+                        "locator": candidate[1],
+                        "mean_ms": round(candidate_time * 1000, 3),
+                        "speedup": round(
+                            baseline / max(candidate_time, 1e-9), 2
+                        ),
+                    }
+            entries.append(entry)
+        return sorted(entries, key=lambda item: item["total_ms"], reverse=True)
+
+    def write_report(self, path) -> list:
+        """
+        Write the ranked report as json and return it.
+        Args:
+            - path: json file to write
+        """
+        report = self.report()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wt") as f:
+            dump(report, f, indent=2)
+        return report
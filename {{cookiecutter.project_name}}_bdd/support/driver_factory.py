@@ -4,6 +4,12 @@ from selenium import webdriver
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 
+from {{cookiecutter.project_name}}_bdd.support.command_recorder import (
+    CommandRecorder,
+    ReplayWebDriver,
+)
+from {{cookiecutter.project_name}}_bdd.utils import constants
+
 
 class SeleniumDriverFactory(object):
     """
@@ -11,6 +17,8 @@ class SeleniumDriverFactory(object):
     The settings for the DriverFactory is on behave.ini file.
     It runs the tests through selenium grid if 'selenium_grid', on behave.ini, is true.
     If is False, it executes the Driver Managers for running tests.
+    If 'record_commands' is true, every WebDriver command and response is recorded.
+    If 'replay_commands' is true, recorded commands are replayed without any browser.
     Supported browsers:
         - firefox
         - chrome
@@ -22,8 +30,25 @@ class SeleniumDriverFactory(object):
         self.version = self.context.userdata.get("version", "")
         self.platform = self.context.userdata.get("platform", "")
         self.use_grid = self.context.userdata.get("use_grid", "")
+        self.record_commands = self.context.userdata.get(
+            "record_commands", ""
+        )
+        self.replay_commands = self.context.userdata.get(
+            "replay_commands", ""
+        )
 
     def get_driver(self):
+        if self.replay_commands in [True, "true", "True", "TRUE", "1"]:
+            return ReplayWebDriver(constants.RECORDINGS_DIR)
+
+        driver = self._get_browser_driver()
+        if self.record_commands in [True, "true", "True", "TRUE", "1"]:
+            driver.command_executor = CommandRecorder(
+                driver.command_executor, constants.RECORDINGS_DIR
+            )
+        return driver
+
+    def _get_browser_driver(self):
         if self.use_grid in [True, "true", "True", "TRUE", "1"]:
             selenium_grid_ip = self.context.userdata.get(
                 "selenium_grid_ip", ""
@@ -0,0 +1,137 @@
+import psutil
+
+
+class DriverWatchdog(object):
+    """
+    Track memory, open files and processes of the driver process tree, i.e.
+    chromedriver or geckodriver and the browser processes it started.
+    The driver is recycled, quitting it and starting a new one, after
+    every scenario in which a threshold set on behave.ini is crossed:
+        - recycle_driver_after_scenarios: scenarios run by the same driver
+        - max_browser_memory_mb: RSS of the process tree, in MB
+        - max_browser_open_files: file descriptors (handles on windows)
+        - max_browser_processes: processes in the tree
+    Empty thresholds are not checked. Drivers on selenium grid have no local
+    processes, so only 'recycle_driver_after_scenarios' applies to them.
+    Every process seen is killed, if still running, on 'shutdown'.
+    """
+
+    def __init__(self, context, start_driver):
+        self.context = context
+        self.start_driver = start_driver
+        self.scenarios = 0
+        self.processes = set()
+
+        userdata = self.context.userdata
+        self.max_scenarios = int(
+            userdata.get("recycle_driver_after_scenarios", "") or 0
+        )
+        self.max_memory_mb = float(
+            userdata.get("max_browser_memory_mb", "") or 0
+        )
+        self.max_open_files = int(
+            userdata.get("max_browser_open_files", "") or 0
+        )
+        self.max_processes = int(
+            userdata.get("max_browser_processes", "") or 0
+        )
+
+    def _process_tree(self) -> list:
+        service = getattr(self.context.driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is None:
+            return []
+        try:
+            root = psutil.Process(process.pid)
+            tree = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+        self.processes.update(tree)
+        return tree
+
+    def sample(self) -> dict:
+        """
+        Return memory, in MB, open files and processes of the driver tree.
+        """
+        usage = {"memory_mb": 0.0, "open_files": 0, "processes": 0}
+        for process in self._process_tree():
+            try:
+                with process.oneshot():
+                    usage["memory_mb"] += process.memory_info().rss / 2**20
+                    usage["open_files"] += (
+                        process.num_fds()
+                        if psutil.POSIX
+                        else process.num_handles()
+                    )
+                    usage["processes"] += 1
+            except psutil.Error:
+                continue
+        usage["memory_mb"] = round(usage["memory_mb"], 2)
+        return usage
+
+    def exceeded_thresholds(self, usage) -> list:
+        """
+        Return the thresholds crossed by the driver.
+        Args:
+            - usage: result of 'sample'
+        """
+        checks = [
+            ("scenarios", self.scenarios, self.max_scenarios),
+            ("memory_mb", usage["memory_mb"], self.max_memory_mb),
+            ("open_files", usage["open_files"], self.max_open_files),
+            ("processes", usage["processes"], self.max_processes),
+        ]
+        return [
+            f"{name} {value} >= {threshold}"
+            for name, value, threshold in checks
+            if threshold and value >= threshold
+        ]
+
+    def after_scenario(self) -> None:
+        """
+        Sample the driver tree and recycle the driver if needed.
+        """
+        self.scenarios += 1
+        usage = self.sample()
+        self.context.logger.info(f"Driver resources usage: {usage}")
+
+        exceeded = self.exceeded_thresholds(usage)
+        if exceeded:
+            self.context.logger.info(f"Recycling driver. Reached: {exceeded}")
+            self.recycle()
+
+    def recycle(self) -> None:
+        """
+        Quit the driver, kill its leftover processes and start a new one.
+        """
+        self.shutdown()
+        self.context.driver = self.start_driver(self.context)
+        self.scenarios = 0
+        self._process_tree()
+
+    def shutdown(self) -> None:
+        """
+        Quit the driver and kill every process seen that is still running.
+        """
+        self._process_tree()
+        try:
+            self.context.driver.quit()
+        except Exception as e:
+            self.context.logger.error(
+                f"Unable to quit driver!" f"Error: {e}", exc_info=True
+            )
+
+        leftovers = [
+            process for process in self.processes if process.is_running()
+        ]
+        for process in leftovers:
+            try:
+                process.kill()
+            except psutil.Error:
+                continue
+        psutil.wait_procs(leftovers, timeout=5)
+        if leftovers:
+            self.context.logger.info(
+                f"Killed leftover processes {[p.pid for p in leftovers]}"
+            )
+        self.processes.clear()
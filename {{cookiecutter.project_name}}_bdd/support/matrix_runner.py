@@ -0,0 +1,242 @@
+"""
+    Matrix runner runs the suite against several browsers concurrently, one
+    behave process per browser, each with its own driver session and its own
+    artifacts namespace, matrix/<browser>/, holding log, screenshots,
+    recordings and caches. Results are merged into matrix/report.json, with
+    the status and duration of every scenario on every browser.
+
+    Run it from the project folder, with any behave option:
+        python -m {{cookiecutter.project_name}}_bdd.support.matrix_runner
+            --browsers chrome,firefox -D use_grid=True
+"""
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from json import dump, load
+
+from {{cookiecutter.project_name}}_bdd.utils import constants
+
+DEFAULT_BROWSERS = "chrome,firefox"
+
+
+class MatrixRunner(object):
+    """
+    Run behave once per browser, concurrently, and merge the results.
+    """
+
+    def __init__(self, browsers, args, directory=constants.MATRIX_DIR):
+        self.browsers = list(browsers)
+        self.args = list(args)
+        self.directory = directory
+
+    def artifacts_dir(self, browser) -> str:
+        return os.path.join(self.directory, browser)
+
+    def results_file(self, browser) -> str:
+        return os.path.join(self.artifacts_dir(browser), "results.json")
+
+    def start(self, browser) -> subprocess.Popen:
+        """
+        Start behave for a browser, writing its output on its namespace.
+        Args:
+            - browser: 'chrome' or 'firefox'
+        """
+        directory = self.artifacts_dir(browser)
+        os.makedirs(directory, exist_ok=True)
+        command = [sys.executable, "-m", "behave"] + self.args
+        command += ["-D", f"browser={browser}"]
+        command += ["--format", "plain", "--outfile", "-"]
+        command += ["--format", "json"]
+        command += ["--outfile", self.results_file(browser)]
+        with open(os.path.join(directory, "output.txt"), "wt") as output:
+            return subprocess.Popen(
+                command,
+                env=dict(os.environ, ARTIFACTS_DIR=directory),
+                stdout=output,
+                stderr=subprocess.STDOUT,
+            )
+
+    def run(self) -> dict:
+        """
+        Run every browser and return the merged report.
+        """
+        processes = {browser: self.start(browser) for browser in self.browsers}
+        exit_codes = {
+            browser: process.wait() for browser, process in processes.items()
+        }
+        report = self.merge(exit_codes)
+        with open(os.path.join(self.directory, "report.json"), "wt") as f:
+            dump(report, f, indent=2)
+        return report
+
+    def _scenarios(self, browser) -> list:
+        try:
+            with open(self.results_file(browser), "rt") as f:
+                features = load(f)
+        except (OSError, ValueError):
+            return []
+
+        scenarios = []
+        for feature in features:
+            for element in feature.get("elements", []):
+                if element.get("type") == "background":
+                    continue
+                results = [
+                    step["result"]
+                    for step in element.get("steps", [])
+                    if "result" in step
+                ]
+                # Last line of a traceback holds the exception raised
+                errors = [
+                    [line for line in lines if line.strip()][-1]
+                    for lines in (
+                        _lines(result.get("error_message"))
+                        for result in results
+                    )
+                    if any(line.strip() for line in lines)
+                ]
+                scenarios.append(
+                    {
+                        "feature": feature["name"],
+                        "scenario": element["name"],
+                        "location": element["location"],
+                        "status": element.get("status") or "untested",
+                        "duration": round(
+                            sum(r.get("duration", 0) for r in results), 3
+                        ),
+                        "error": errors[0] if errors else None,
+                    }
+                )
+        return scenarios
+
+    def merge(self, exit_codes) -> dict:
+        """
+        Merge the results of every browser by scenario location.
+        Args:
+            - exit_codes: exit code of behave per browser
+        """
+        scenarios = {}
+        totals = {}
+        for browser in self.browsers:
+            total = {"exit_code": exit_codes[browser], "duration": 0.0}
+            for result in self._scenarios(browser):
+                scenario = scenarios.setdefault(
+                    result["location"],
+                    {
+                        "feature": result["feature"],
+                        "scenario": result["scenario"],
+                        "location": result["location"],
+                        "browsers": {},
+                    },
+                )
+                scenario["browsers"][browser] = {
+                    "status": result["status"],
+                    "duration": result["duration"],
+                    "error": result["error"],
+                }
+                total[result["status"]] = total.get(result["status"], 0) + 1
+                total["duration"] = round(
+                    total["duration"] + result["duration"], 3
+                )
+            totals[browser] = total
+
+        for scenario in scenarios.values():
+            results = scenario["browsers"].values()
+            durations = [result["duration"] for result in results]
+            scenario["status_differs"] = (
+                len({result["status"] for result in results}) > 1
+                or len(scenario["browsers"]) < len(self.browsers)
+            )
+            scenario["duration_spread"] = round(
+                max(durations) - min(durations), 3
+            )
+
+        return {
+            "browsers": self.browsers,
+            "totals": totals,
+            "scenarios": sorted(
+                scenarios.values(),
+                key=lambda s: (
+                    not s["status_differs"],
+                    -s["duration_spread"],
+                ),
+            ),
+        }
+
+
+def _lines(message) -> list:
+    # Behave writes multiline error messages as lists of lines
+    if isinstance(message, str):
+        return message.splitlines()
+    return message or []
+
+
+def print_report(report, top=10) -> None:
+    """
+    Print totals per browser, scenarios whose status differs between
+    browsers and the scenarios with the widest timing differences.
+    Args:
+        - report: result of 'MatrixRunner.run'
+        - top: number of scenarios printed by timing difference
+    """
+    for browser, total in report["totals"].items():
+        counts = ", ".join(
+            f"{total.get(status, 0)} {status}"
+            for status in ["passed", "failed", "skipped"]
+        )
+        print(f"{browser}: {counts} in {total['duration']}s")
+
+    def results(scenario) -> str:
+        return ", ".join(
+            f"{browser} {result['status']} {result['duration']}s"
+            for browser, result in scenario["browsers"].items()
+        )
+
+    differs = [s for s in report["scenarios"] if s["status_differs"]]
+    if differs:
+        print("Status differs between browsers:")
+    for scenario in differs:
+        print(
+            f"    {scenario['location']} {scenario['scenario']}: "
+            f"{results(scenario)}"
+        )
+
+    slowest = sorted(
+        report["scenarios"], key=lambda s: -s["duration_spread"]
+    )[:top]
+    if slowest:
+        print("Widest timing differences:")
+    for scenario in slowest:
+        print(
+            f"    {scenario['location']} {scenario['scenario']} "
+            f"({scenario['duration_spread']}s): {results(scenario)}"
+        )
+
+
+def main(args=None) -> None:
+    parser = ArgumentParser(
+        description="Run the suite against several browsers concurrently. "
+        "Other options are passed along to behave."
+    )
+    parser.add_argument(
+        "--browsers",
+        default=DEFAULT_BROWSERS,
+        help=f"comma separated browsers, default '{DEFAULT_BROWSERS}'",
+    )
+    options, behave_args = parser.parse_known_args(args)
+    browsers = [b.strip() for b in options.browsers.split(",") if b.strip()]
+    if not browsers:
+        parser.error("no browsers to run")
+
+    report = MatrixRunner(browsers, behave_args).run()
+    print_report(report)
+    print(
+        f"Matrix report is saved in file "
+        f"'{os.path.join(constants.MATRIX_DIR, 'report.json')}'"
+    )
+    sys.exit(max(total["exit_code"] for total in report["totals"].values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+from collections import defaultdict
+from json import dump, load
+from statistics import median
+from urllib.parse import urlsplit
+
+from {{cookiecutter.project_name}}_bdd.support.core import java_script
+
+
+class PagePerformance(object):
+    """
+    Collect Navigation Timing, Resource Timing and paint metrics of every
+    page loaded during the run, through a single script call per capture.
+    Captures are kept per scenario and summarized per page (url without
+    query string), so they can be compared against a stored baseline.
+    Compared metrics, in milliseconds:
+        - dns, connect, ttfb, response
+        - dom_interactive, dom_content_loaded, load
+        - first_paint, first_contentful_paint
+        - resources_end
+    """
+
+    metrics = [
+        "dns",
+        "connect",
+        "ttfb",
+        "response",
+        "dom_interactive",
+        "dom_content_loaded",
+        "load",
+        "first_paint",
+        "first_contentful_paint",
+        "resources_end",
+    ]
+
+    def __init__(self):
+        self.captures = []
+        self._last_time_origin = None
+
+    def capture(self, driver, scenario_name) -> [dict, None]:
+        """
+        Capture the timings of the current page.
+        Pages already captured, i.e. when a step did not navigate, are
+        skipped, so it is cheap to call after every step. Pages whose load
+        event has not ended yet are skipped too, to be captured on a later
+        call instead of recording an empty 'load'.
+        Args:
+            - driver: webdriver showing the page
+            - scenario_name: name of the feature or scenario running
+        """
+        timings = driver.execute_script(java_script.PAGE_TIMINGS)
+        if not timings or timings["time_origin"] == self._last_time_origin:
+            return None
+        self._last_time_origin = timings["time_origin"]
+
+        url = urlsplit(timings["url"])
+        timings["page"] = f"{url.scheme}://{url.netloc}{url.path}"
+        timings["scenario"] = scenario_name
+        self.captures.append(timings)
+        return timings
+
+    def summary(self) -> dict:
+        """
+        Return the median of every metric per page.
+        """
+        values = defaultdict(lambda: defaultdict(list))
+        for timings in self.captures:
+            for metric in self.metrics:
+                if timings.get(metric) is not None:
+                    values[timings["page"]][metric].append(timings[metric])
+        return {
+            page: {
+                metric: round(median(samples), 2)
+                for metric, samples in metrics.items()
+            }
+            for page, metrics in values.items()
+        }
+
+    def compare(self, baseline, threshold_percent, threshold_ms) -> list:
+        """
+        Return the metrics slower than the baseline beyond both thresholds.
+        Args:
+            - baseline: summary of a previous run, see 'summary'
+            - threshold_percent: tolerated slowdown, in percent
+            - threshold_ms: tolerated slowdown, in milliseconds
+        """
+        regressions = []
+        for page, metrics in self.summary().items():
+            for metric, value in metrics.items():
+                expected = baseline.get(page, {}).get(metric)
+                if expected is None:
+                    continue
+                delta = value - expected
+                if (
+                    delta > threshold_ms
+                    and value > expected * (1 + threshold_percent / 100)
+                ):
+                    regressions.append(
+                        {
+                            "page": page,
+                            "metric": metric,
+                            "baseline": expected,
+                            "value": value,
+                            "delta": round(delta, 2),
+                        }
+                    )
+        return regressions
+
+    def write(self, path) -> None:
+        """
+        Write captures, per scenario, and summary, per page, as json.
+        Args:
+            - path: json file to write
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wt") as f:
+            dump(
+                {"captures": self.captures, "pages": self.summary()},
+                f,
+                indent=2,
+            )
+
+    def load_baseline(self, path) -> [dict, None]:
+        """
+        Return the baseline summary, or None when it was not saved yet.
+        Args:
+            - path: json file holding the baseline
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rt") as f:
+            return load(f)
+
+    def save_baseline(self, path) -> None:
+        """
+        Save the summary of this run as the baseline of the next ones.
+        Args:
+            - path: json file to write
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wt") as f:
+            dump(self.summary(), f, indent=2, sort_keys=True)
@@ -0,0 +1,307 @@
+"""
+    Watch mode keeps the process and one browser session alive between runs.
+    It watches features/, support/ and utils/ and, on every change, reloads
+    the changed modules and re-runs only the scenarios affected by them:
+        - feature files: the whole feature
+        - step modules: scenarios with steps defined on them
+        - support and utils modules: scenarios with steps defined on step
+        modules that import them, directly or through other modules
+        - environment.py, or deleted files: every scenario
+
+    Run it from the project folder, with any behave option but paths:
+        python -m {{cookiecutter.project_name}}_bdd.support.watch_mode --no-capture
+"""
+import ast
+import os
+import sys
+import time
+from importlib import import_module, reload
+from logging import getLogger
+
+from behave.__main__ import run_behave
+from behave.configuration import Configuration
+from behave.parser import parse_file
+from behave.runner import Runner
+from behave.step_registry import registry
+
+PACKAGE = "{{cookiecutter.project_name}}_bdd"
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WATCHED_DIRS = ["features", "support", "utils"]
+
+logger = getLogger(__name__)
+
+
+class WarmSession(object):
+    """
+    Browser session kept alive between watch mode runs.
+    While 'active', set only by a running WatchMode, before_all reuses
+    'driver' and after_all keeps it, instead of starting and quitting a
+    driver every run.
+    """
+
+    active = False
+    driver = None
+
+
+class WatchMode(object):
+    """
+    Run behave in-process and re-run it on the scenarios affected by the
+    changed files.
+    """
+
+    def __init__(self, args, poll_interval=0.5):
+        self.args = list(args)
+        self.poll_interval = poll_interval
+        self.mtimes = self._scan()
+
+    @staticmethod
+    def _scan() -> dict:
+        mtimes = {}
+        for directory in WATCHED_DIRS:
+            path = os.path.join(PROJECT_DIR, directory)
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name.endswith((".py", ".feature")):
+                        path = os.path.join(root, name)
+                        mtimes[path] = os.stat(path).st_mtime
+        return mtimes
+
+    def changed_files(self) -> list:
+        """
+        Return files created, modified or deleted since the last call.
+        """
+        mtimes = self._scan()
+        changed = [
+            path
+            for path in set(mtimes) | set(self.mtimes)
+            if mtimes.get(path) != self.mtimes.get(path)
+        ]
+        self.mtimes = mtimes
+        return sorted(changed)
+
+    @staticmethod
+    def _module_name(path) -> [str, None]:
+        relative_path = os.path.relpath(path, PROJECT_DIR)
+        if relative_path.split(os.sep)[0] not in ["support", "utils"]:
+            return None
+        parts = relative_path[: -len(".py")].split(os.sep)
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        return ".".join([PACKAGE] + parts)
+
+    @staticmethod
+    def _imports(path) -> set:
+        with open(path, "rt") as f:
+            tree = ast.parse(f.read(), path)
+        imports = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                imports.add(node.module)
+                imports.update(
+                    f"{node.module}.{alias.name}" for alias in node.names
+                )
+        return {name for name in imports if name.startswith(PACKAGE)}
+
+    def _dependents(self, modules) -> tuple:
+        """
+        Return the modules and the step files importing, directly or not,
+        the modules. Modules, including the given ones, come in reload order,
+        after the modules they import.
+        Args:
+            - modules: names of the changed modules
+        """
+        imports = {
+            path: self._imports(path)
+            for path in self.mtimes
+            if path.endswith(".py")
+        }
+        names = {path: self._module_name(path) for path in imports}
+        affected = set(modules)
+        step_files = set()
+        found = True
+        while found:
+            found = False
+            for path, imported in imports.items():
+                if names[path] in affected or path in step_files:
+                    continue
+                if imported & affected:
+                    found = True
+                    if names[path] is None:
+                        step_files.add(path)
+                    else:
+                        affected.add(names[path])
+
+        module_imports = {
+            names[path]: imported & affected
+            for path, imported in imports.items()
+            if names[path] in affected
+        }
+        ordered = []
+        while len(ordered) < len(affected):
+            ready = sorted(
+                name
+                for name in affected - set(ordered)
+                if module_imports.get(name, set()) - {name} <= set(ordered)
+            )
+            # Circular imports are reloaded in name order
+            ordered.extend(ready or sorted(affected - set(ordered))[:1])
+        return ordered, step_files
+
+    @staticmethod
+    def _clear_step_registry() -> None:
+        for step_definitions in registry.steps.values():
+            del step_definitions[:]
+
+    def _config(self, paths=None) -> Configuration:
+        return Configuration(command_args=self.args + (paths or []))
+
+    def affected_locations(self, step_files) -> list:
+        """
+        Return 'file:line' of the scenarios with steps defined on step files.
+        Args:
+            - step_files: paths of the step modules
+        """
+        self._clear_step_registry()
+        config = self._config()
+        runner = Runner(config)
+        with runner.path_manager:
+            runner.setup_paths()
+            runner.load_step_definitions()
+
+        locations = []
+        for path in self.mtimes:
+            if not path.endswith(".feature"):
+                continue
+            feature = parse_file(path, language=config.lang)
+            if feature is None:
+                continue
+            background = (
+                feature.background.steps if feature.background else []
+            )
+            for scenario in feature.scenarios:
+                scenarios = getattr(scenario, "scenarios", [scenario])
+                steps = background + [
+                    step for item in scenarios for step in item.steps
+                ]
+                for step in steps:
+                    match = registry.find_match(step)
+                    if match and os.path.abspath(
+                        match.location.filename
+                    ) in step_files:
+                        locations.append(
+                            f"{os.path.relpath(path)}:{scenario.line}"
+                        )
+                        break
+        self._clear_step_registry()
+        return locations
+
+    def affected_paths(self, changed) -> [list, None]:
+        """
+        Reload changed modules and return the paths behave has to run.
+        Returns None when every scenario has to run.
+        Args:
+            - changed: files changed
+        """
+        feature_files = set()
+        step_files = set()
+        modules = []
+        for path in changed:
+            if not os.path.exists(path):
+                if path.endswith(".feature"):
+                    continue
+                return None
+            if path.endswith(".feature"):
+                feature_files.add(os.path.relpath(path))
+            elif os.path.basename(path) == "environment.py":
+                return None
+            elif self._module_name(path) is None:
+                step_files.add(path)
+            else:
+                modules.append(self._module_name(path))
+
+        modules, dependent_step_files = self._dependents(modules)
+        for name in modules:
+            if name in sys.modules and name != __name__:
+                reload(sys.modules[name])
+        # Modules imported by the hooks change every scenario
+        if any(
+            os.path.basename(path) == "environment.py"
+            for path in dependent_step_files
+        ):
+            return None
+        step_files |= dependent_step_files
+
+        locations = self.affected_locations(step_files) if step_files else []
+        return sorted(feature_files) + [
+            location
+            for location in locations
+            if location.rsplit(":", 1)[0] not in feature_files
+        ]
+
+    def run(self, paths=None) -> int:
+        """
+        Run behave in-process, on paths or on the default ones.
+        Args:
+            - paths: feature files or 'file:line' locations to run
+        """
+        self._clear_step_registry()
+        return run_behave(self._config(paths))
+
+    def run_changes(self) -> None:
+        """
+        Re-run the scenarios affected by the files changed since last call.
+        """
+        changed = self.changed_files()
+        if not changed:
+            return
+        logger.info(f"Changed files: {[os.path.relpath(p) for p in changed]}")
+        paths = self.affected_paths(changed)
+        if paths is None:
+            self.run()
+        elif paths:
+            self.run(paths)
+        else:
+            logger.warning("No scenario affected by the changes")
+
+    def watch(self) -> None:
+        """
+        Run every scenario, then re-run the affected ones on every change,
+        until interrupted. Errors, i.e. on half-edited files, are logged and
+        the session is kept alive until the next change.
+        """
+        WarmSession.active = True
+        try:
+            run = self.run
+            while True:
+                try:
+                    run()
+                except Exception as e:
+                    logger.error(
+                        f"Unable to run changes! Error: {e}", exc_info=True
+                    )
+                run = self.run_changes
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            WarmSession.active = False
+            if WarmSession.driver is not None:
+                try:
+                    WarmSession.driver.quit()
+                except Exception as e:
+                    logger.error(
+                        f"Unable to quit warm driver! Error: {e}",
+                        exc_info=True,
+                    )
+                WarmSession.driver = None
+
+
+def main(args=None) -> None:
+    WatchMode(sys.argv[1:] if args is None else args).watch()
+
+
+if __name__ == "__main__":
+    # Run through the package module, so environment.py shares WarmSession
+    import_module(f"{PACKAGE}.support.watch_mode").main()
@@ -87,3 +87,60 @@ class Assert(object):
             - message: message to be displayed in case of assertion fails
         """
         assert_that(False, equal_to(True), message)
+
+    @staticmethod
+    def assert_snapshot(snapshot, expected, message=None) -> None:
+        """
+        Assert a page snapshot matches the expected values, reporting every
+        mismatch at once instead of failing on the first one
+        Args:
+            - snapshot: result of 'ElementAction.get_snapshot'
+            - expected: mapping of element name to expected fields, i.e.
+            {"title": {"text": "Home", "visible": True}}, or a behave table
+            whose first column holds the element names and the other
+            headings the fields. Empty cells are not checked.
+            - message: message to be displayed in case of assertion fails
+        """
+        mismatches = []
+        for name, fields in Assert.parse_snapshot(expected).items():
+            actual = snapshot.get(name) or {"present": False}
+            for field, expected_value in fields.items():
+                actual_value = actual.get(field)
+                if not Assert._snapshot_value_matches(
+                    actual_value, expected_value
+                ):
+                    mismatches.append(
+                        f"{name}.{field}: expected {expected_value!r}, "
+                        f"got {actual_value!r}"
+                    )
+        if mismatches:
+            Assert.assert_fail(
+                "\n".join([message or "Snapshot mismatches:", *mismatches])
+            )
+
+    @staticmethod
+    def parse_snapshot(expected) -> dict:
+        """
+        Return expected snapshot values as a mapping of element name to fields
+        Args:
+            - expected: mapping or behave table, see 'assert_snapshot'
+        """
+        if not hasattr(expected, "headings"):
+            return expected
+        name_heading, *field_headings = expected.headings
+        return {
+            row[name_heading]: {
+                field: row[field]
+                for field in field_headings
+                if row[field].strip() != ""
+            }
+            for row in expected
+        }
+
+    @staticmethod
+    def _snapshot_value_matches(actual, expected) -> bool:
+        if actual == expected:
+            return True
+        if isinstance(actual, bool) or actual is None:
+            return str(actual).lower() == str(expected).strip().lower()
+        return str(actual) == str(expected)
@@ -1,6 +1,18 @@
-from os import getcwd
+from os import environ, getcwd
 from os.path import join
 
 PATH = getcwd()
-LOG_FILE_DIR = join(PATH, "log")
-LOGGER_CONFIG = join(PATH, "utils", "logging.json")
\ No newline at end of file
+# Namespace of the run artifacts, set per browser by the matrix runner
+ARTIFACTS_DIR = join(PATH, environ.get("ARTIFACTS_DIR", ""))
+LOG_FILE_DIR = join(ARTIFACTS_DIR, "log")
+LOGGER_CONFIG = join(PATH, "utils", "logging.json")
+SCREENSHOTS_DIR = join(ARTIFACTS_DIR, "screenshots")
+INTERACTION_CACHE = join(
+    ARTIFACTS_DIR, ".cache", "interaction_strategies.json"
+)
+LOCATOR_PROFILE_REPORT = join(LOG_FILE_DIR, "locator_profile.json")
+PAGE_PERFORMANCE_REPORT = join(LOG_FILE_DIR, "page_performance.json")
+PAGE_PERFORMANCE_BASELINE = join(ARTIFACTS_DIR, "performance_baseline.json")
+RECORDINGS_DIR = join(ARTIFACTS_DIR, "recordings")
+EVENT_STREAM_FILE = join(LOG_FILE_DIR, "events.jsonl")
+MATRIX_DIR = join(PATH, "matrix")
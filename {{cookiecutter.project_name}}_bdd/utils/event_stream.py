@@ -0,0 +1,89 @@
+import os
+from itertools import count
+from json import dumps
+from time import perf_counter, time
+from uuid import uuid4
+
+
+class EventStream(object):
+    """
+    Write one compact json record per line for every lifecycle event and
+    element action, so runs can be parsed by machines instead of grepping
+    the log banners. Records are written through a buffered file and hold:
+        - run_id: id shared by every record of the same run
+        - ts: unix timestamp of the event
+        - event: name of the event, i.e. 'scenario_started' or 'action'
+        - feature_id, scenario_id, step_id: ids of the running items
+    """
+
+    def __init__(self, path, buffer_size=64 * 1024):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(
+            path, "at", buffering=buffer_size, encoding="utf8"
+        )
+        self._ids = count(1)
+        self._scope = {}
+        self._started_at = {}
+        self.run_id = uuid4().hex[:12]
+
+    def emit(self, event, **fields) -> None:
+        """
+        Write a record.
+        Args:
+            - event: name of the event
+            - fields: fields of the record, serialized as json
+        """
+        record = {"run_id": self.run_id, "ts": round(time(), 3)}
+        record["event"] = event
+        record.update(
+            (f"{kind}_id", item_id) for kind, item_id in self._scope.items()
+        )
+        record.update(fields)
+        try:
+            line = dumps(record, separators=(",", ":"), default=str)
+        except (TypeError, ValueError):
+            # i.e. mappings keyed by locator tuples
+            line = dumps(
+                {key: _serializable(value) for key, value in record.items()},
+                separators=(",", ":"),
+                default=str,
+            )
+        self._file.write(line + "\n")
+
+    def start(self, kind, **fields) -> None:
+        """
+        Give an id to a feature, scenario or step and write its start.
+        Args:
+            - kind: 'feature', 'scenario' or 'step'
+            - fields: fields of the record
+        """
+        self._scope[kind] = next(self._ids)
+        self._started_at[kind] = perf_counter()
+        self.emit(f"{kind}_started", **fields)
+
+    def finish(self, kind, **fields) -> None:
+        """
+        Write the end of a feature, scenario or step, with its duration.
+        Args:
+            - kind: 'feature', 'scenario' or 'step'
+            - fields: fields of the record, i.e. its status
+        """
+        started_at = self._started_at.pop(kind, None)
+        if started_at is not None:
+            fields["duration"] = round(perf_counter() - started_at, 3)
+        self.emit(f"{kind}_finished", **fields)
+        self._scope.pop(kind, None)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _serializable(value):
+    try:
+        dumps(value, default=str)
+        return value
+    except (TypeError, ValueError):
+        return str(value)